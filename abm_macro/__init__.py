@@ -0,0 +1,6 @@
+"""
+Agent Based Model of Macroeconomy with Satisficing Behaviour
+Authors: Hyun Chang Yi and Sarunas Girdenas
+"""
+from .ensemble import Ensemble, run_ensemble
+from .policies import StepPolicy
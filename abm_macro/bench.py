@@ -0,0 +1,163 @@
+"""
+Throughput benchmarks
+Measures periods per second and peak traced memory of both scalar models at several
+horizons, of the ensemble at several sizes and of the population at several agent
+counts, all with fixed seeds. Every run also times the original scalar loops of
+SimpleMacro.py and SimpleMacro3.py (see reference) and reports each case's speedup
+over the loop of its model, measured on the same machine in the same run. Results
+are written as JSON baselines, and a later run compared against a baseline flags
+every case whose speedup or peak memory got worse by more than the tolerance, so a
+baseline saved on one machine can be checked on another; absolute throughputs are
+kept for information only.
+
+    python -m abm_macro.bench --save benchmarks/baseline.json
+    python -m abm_macro.bench --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import reference, simple_macro, simple_macro3
+from .ensemble import run_ensemble
+from .population import run_population
+
+
+SEED = 2014
+
+# (name, model, periods, economies, agents); economies x periods economy-periods are
+# simulated per case, and agents counts households per economy
+CASES = [
+    ('simple_macro/T=1000', 'simple_macro', 1000, 1, 1),
+    ('simple_macro/T=10000', 'simple_macro', 10000, 1, 1),
+    ('simple_macro3/T=1000', 'simple_macro3', 1000, 1, 1),
+    ('simple_macro3/T=10000', 'simple_macro3', 10000, 1, 1),
+    ('ensemble/n=100', 'ensemble', 500, 100, 1),
+    ('ensemble/n=1000', 'ensemble', 500, 1000, 1),
+    ('ensemble/n=10000', 'ensemble', 500, 10000, 1),
+    ('population/H=1000', 'population', 200, 1, 1000),
+    ('population/H=10000', 'population', 200, 1, 10000),
+    ('population/H=100000', 'population', 200, 1, 100000),
+    ('reference/simple_macro', 'reference_simple_macro', 10000, 1, 1),
+    ('reference/simple_macro3', 'reference_simple_macro3', 10000, 1, 1),
+]
+
+# the original loop each model's speedup is measured against
+REFERENCES = {'simple_macro': 'reference/simple_macro', 'simple_macro3': 'reference/simple_macro3',
+              'ensemble': 'reference/simple_macro3', 'population': 'reference/simple_macro3'}
+
+# the cases of a quick run, e.g. on every change
+QUICK = ('simple_macro/T=1000', 'simple_macro3/T=1000', 'ensemble/n=1000', 'population/H=10000',
+         'reference/simple_macro', 'reference/simple_macro3')
+
+
+def simulate(model, periods, economies, agents):
+    if model == 'simple_macro':
+        return simple_macro.run(periods, seed=SEED)
+    if model == 'simple_macro3':
+        return simple_macro3.run(periods, seed=SEED)
+    if model == 'ensemble':
+        return run_ensemble(periods, economies, seed=SEED)
+    if model == 'population':
+        return run_population(periods, agents, max(1, agents//100), seed=SEED)
+    if model == 'reference_simple_macro':
+        return reference.run_simple_macro(periods, seed=SEED)
+    if model == 'reference_simple_macro3':
+        return reference.run_simple_macro3(periods, seed=SEED)
+    raise ValueError('unknown model {!r}'.format(model))
+
+
+def measure(model, periods, economies, agents, repeat=3, min_time=1.0):
+    # best wall time of at least `repeat` runs lasting min_time seconds in all, then
+    # one traced run for peak memory, kept apart because tracing slows the run down
+    seconds, spent, runs = float('inf'), 0.0, 0
+    while runs < repeat or spent < min_time:
+        start = time.perf_counter()
+        simulate(model, periods, economies, agents)
+        elapsed = time.perf_counter() - start
+        seconds, spent, runs = min(seconds, elapsed), spent + elapsed, runs + 1
+    tracemalloc.start()
+    simulate(model, periods, economies, agents)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'model': model, 'periods': periods, 'economies': economies, 'agents': agents,
+            'seconds': seconds, 'periods_per_second': periods/seconds,
+            'economy_periods_per_second': periods*economies/seconds,
+            'agent_periods_per_second': periods*economies*agents/seconds, 'peak_bytes': peak}
+
+
+def run(names=None, repeat=3, min_time=1.0, progress=None):
+    # the chosen cases and the references they are compared with, references first
+    results = {}
+    chosen = [case for case in CASES if names is None or case[0] in names]
+    wanted = set(REFERENCES.get(case[1], case[0]) for case in chosen)
+    chosen = [case for case in CASES if case[0] in wanted and case not in chosen] + chosen
+    chosen.sort(key=lambda case: case[0] not in REFERENCES.values())
+    for name, model, periods, economies, agents in chosen:
+        results[name] = measure(model, periods, economies, agents, repeat, min_time)
+        reference = results.get(REFERENCES.get(model, name))
+        # per simulated household, so a population of H households with H firms
+        # counts as H economies of the original loop
+        results[name]['speedup'] = (results[name]['agent_periods_per_second']
+                                    /reference['agent_periods_per_second'])
+        if progress is not None:
+            progress(name, results[name])
+    return {'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'platform': platform.platform(), 'processor': platform.processor()},
+            'seed': SEED, 'results': results}
+
+
+def compare(current, baseline, tolerance=0.2):
+    # the cases that lost more than `tolerance` of their baseline speedup over the
+    # original loop or grew their peak memory by more than it
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None or name in REFERENCES.values():
+            continue
+        speed = now['speedup']/before['speedup']
+        memory = now['peak_bytes']/float(max(1, before['peak_bytes']))
+        if speed < 1 - tolerance:
+            regressions.append((name, 'speedup', speed))
+        if memory > 1 + tolerance:
+            regressions.append((name, 'peak memory', memory))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the models.')
+    parser.add_argument('--quick', action='store_true', help='only the cases in QUICK')
+    parser.add_argument('--repeat', type=int, default=3, help='least number of timed runs per case')
+    parser.add_argument('--min-time', type=float, default=1.0, help='least seconds of timed runs per case')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to check against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    def progress(name, result):
+        print('{:<24} {:>12.0f} economy-periods/s {:>12.0f} agent-periods/s {:>8.1f}x original {:>8.1f} MiB peak'.format(
+            name, result['economy_periods_per_second'], result['agent_periods_per_second'],
+            result['speedup'], result['peak_bytes']/2.0**20))
+
+    current = run(QUICK if args.quick else None, args.repeat, args.min_time, progress)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, what, ratio in regressions:
+            print('REGRESSION {}: {} at {:.2f}x of baseline'.format(name, what, ratio))
+        if regressions:
+            return 1
+        print('no regressions beyond {:.0%}'.format(args.tolerance))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
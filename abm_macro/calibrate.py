@@ -0,0 +1,116 @@
+"""
+Simulated method of moments
+A Calibration searches parameter bounds for the parameters whose simulated moments,
+averaged over a fixed set of seeds, come closest to target moments in weighted
+squared distance. Moments are the streaming statistics of summary runs (see stats),
+named like 'price.mean' or 'inflation.var'.
+
+Every candidate is simulated on the same seeds, so the difference between two
+candidates is not drowned in Monte Carlo noise. The search is a pattern search on a
+lattice over the unit cube of the bounds: all poll points of an iteration run as one
+sweep on a process pool, and since poll points lie on the lattice the search revisits
+them exactly, so evaluations are memoized in memory and, through the sweep cache, on
+disk across sessions.
+
+    fit = Calibration({'price.mean': 0.95, 'inflation.var': 1e-4, 'consumption.mean': 2.7,
+                       'capital.mean': 6.0}, cache='calibration').fit()
+    fit['params'], fit['distance']
+"""
+import tempfile
+
+import numpy as np
+
+from .sweep import ResultCache, sweep
+
+
+# parameters calibrated by default, with their bounds
+BOUNDS = {
+    'firm.LAMBDA': (0.001, 0.1),
+    'firm.gamma': (0.1, 1.0),
+    'firm.inertia': (0.5, 0.99),
+    'firm.delta': (0.01, 0.2),
+    'firm.capital_power': (0.2, 0.6),
+    'firm.depreciate': (0.01, 0.1),
+}
+
+
+class Calibration:
+
+    def __init__(self, targets, bounds=BOUNDS, weights=None, fixed=None, model='simple_macro3',
+                 T=5000, replications=8, seed=0, cache=None, workers=None, resolution=64, convergence=None):
+        # targets maps moment names to target values; weights default to 1/target**2,
+        # so each moment counts by its relative error; fixed holds parameters kept
+        # out of the search, e.g. {'policy': None}; convergence, Convergence arguments,
+        # ends every run once it converged (see sweep)
+        self.targets, self.names = dict(targets), sorted(bounds)
+        self.bounds = np.array([bounds[name] for name in self.names], dtype=float)
+        self.weights = dict((name, 1.0/value**2 if value else 1.0) for name, value in self.targets.items())
+        self.weights.update(weights or {})
+        self.fixed, self.model, self.T = dict(fixed or {}), model, T
+        # common random numbers: every candidate runs on these seeds
+        self.seeds = [(seed, k) for k in range(replications)]
+        # without a cache, evaluations are kept on disk as long as the calibration
+        self.scratch = tempfile.TemporaryDirectory(prefix='calibration') if cache is None else None
+        self.cache = self.scratch.name if cache is None else cache
+        self.workers, self.resolution, self.convergence = workers, resolution, convergence
+        self.memo, self.evaluations = {}, 0
+
+    def params(self, point):
+        # the parameters at a lattice point, a tuple of ints in 0..resolution
+        lo, hi = self.bounds[:, 0], self.bounds[:, 1]
+        values = lo + (hi - lo)*np.asarray(point)/float(self.resolution)
+        params = dict(self.fixed)
+        params.update((name, float(value)) for name, value in zip(self.names, values))
+        return params
+
+    def evaluate(self, points):
+        # moments and distance of every point not seen yet, simulated as one sweep
+        fresh = [point for point in dict.fromkeys(points) if point not in self.memo]
+        if fresh:
+            cells = [self.params(point) for point in fresh]
+            records = sweep(self.model, cells, self.seeds, self.T, self.cache,
+                            workers=self.workers, summary=True, convergence=self.convergence)
+            store = ResultCache(self.cache)
+            for k, point in enumerate(fresh):
+                runs = [store.load(record['key']) for record in records[k*len(self.seeds):(k + 1)*len(self.seeds)]]
+                moments = dict((name, float(np.mean([run[name] for run in runs]))) for name in self.targets)
+                self.memo[point] = (self.distance(moments), moments)
+            self.evaluations += len(fresh)
+        return [self.memo[point] for point in points]
+
+    def distance(self, moments):
+        return sum(self.weights[name]*(moments[name] - target)**2 for name, target in self.targets.items())
+
+    def fit(self, start=None, step=0.25, max_evaluations=500, progress=None):
+        # pattern search from start (parameters, by default the middle of the bounds):
+        # poll +-step along every axis, move to the best improving point, and halve
+        # the step when none improves, down to one lattice cell
+        N = self.resolution
+        if start is None:
+            point = (N//2,)*len(self.names)
+        else:
+            lo, hi = self.bounds[:, 0], self.bounds[:, 1]
+            unit = (np.array([start[name] for name in self.names]) - lo)/(hi - lo)
+            point = tuple(int(round(u*N)) for u in np.clip(unit, 0, 1))
+        best, moments = self.evaluate([point])[0]
+        history = [(self.evaluations, best, self.params(point))]
+        h = max(1, int(round(step*N)))
+        while h >= 1 and self.evaluations < max_evaluations:
+            poll = []
+            for axis in range(len(point)):
+                for sign in (-1, 1):
+                    moved = list(point)
+                    moved[axis] = min(N, max(0, moved[axis] + sign*h))
+                    if tuple(moved) != point:
+                        poll.append(tuple(moved))
+            results = self.evaluate(poll)
+            k = int(np.argmin([distance for distance, m in results]))
+            if results[k][0] < best:
+                point, (best, moments) = poll[k], results[k]
+            else:
+                h //= 2
+            history.append((self.evaluations, best, self.params(point)))
+            if progress is not None:
+                progress(*history[-1])
+        return {'params': self.params(point), 'distance': best, 'moments': moments,
+                'targets': self.targets, 'evaluations': self.evaluations, 'history': history}
@@ -0,0 +1,76 @@
+"""
+Snapshots of a running economy
+A snapshot is the pickled economy: every agent's tables and aspiration levels, the
+recorded history and the state of its random streams. Restoring it continues the run
+exactly where it stopped, and forking it starts many branches from one burn-in:
+
+    economy = simple_macro3.Economy({'policy': None}, seed=1)
+    economy.run(5000)
+    burn_in = snapshot(economy)
+    branches = fork(burn_in, [StepPolicy(5000, 0.05, r) for r in (0.06, 0.07, 0.08)])
+    results = [branch.run(5000) for branch in branches]
+
+Economies recording to disk through a ChunkWriter hold open files and cannot be
+snapshotted; record in memory up to the snapshot instead.
+"""
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .policies import StepPolicy
+from .rng import run_seed
+
+
+def snapshot(economy):
+    return pickle.dumps(economy, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def restore(snap):
+    return pickle.loads(snap)
+
+
+def save(economy, path):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(snapshot(economy))
+    os.replace(tmp, path)
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return restore(f.read())
+
+
+def branch(snap, policy, seed=None):
+    # a restored economy continuing under policy, on fresh streams if seeded; policy
+    # must be None for economies without a policy path
+    economy = restore(snap)
+    if hasattr(economy, 'policy'):
+        economy.policy = StepPolicy(**policy) if isinstance(policy, dict) else policy
+    elif policy is not None:
+        # the simple_macro Bank always follows its Taylor rule
+        raise ValueError('{} economies take no policy path'.format(type(economy).__module__.rsplit('.', 1)[-1]))
+    if seed is not None:
+        economy.reseed(seed)
+    return economy
+
+
+def fork(snap, policies, seed=None):
+    # one branch per policy path, given as a policy object or StepPolicy parameters;
+    # without a seed every branch continues on the same random streams, with one
+    # branch k continues on run_seed(seed, k)
+    return [branch(snap, policy, None if seed is None else run_seed(seed, k))
+            for k, policy in enumerate(policies)]
+
+
+def _run_branch(snap, policy, seed, T):
+    return branch(snap, policy, seed).run(T)
+
+
+def run_branches(snap, policies, T, seed=None, workers=None):
+    # fork and run every branch for T more periods on a process pool, returning the
+    # results of each branch in the order of policies
+    seeds = [None if seed is None else run_seed(seed, k) for k in range(len(policies))]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_run_branch, snap, policy, s, T) for policy, s in zip(policies, seeds)]
+        return [future.result() for future in futures]
@@ -0,0 +1,89 @@
+"""
+Convergence detection
+A Convergence monitor watches the indicators of an economy (aspiration and valuation
+levels at the current node and the latest recorded series) in blocks of periods. An
+indicator has settled when its block mean moved by no more than z standard errors of
+the difference of the two block means, plus atol + rtol*|previous mean| for
+indicators that hardly vary. The indicators are persistent, so the standard error of
+a block mean comes from the means of its `batches` batches rather than from its
+periods. The economy has converged once every indicator settled over `patience`
+consecutive blocks. Passed as `stop` to run(), the monitor ends the run there, or,
+with regimes=True, ends the regime before a StepPolicy switch by bringing the switch
+forward and keeps watching the next regime.
+
+    stop = Convergence()
+    results = simple_macro3.run(20000, seed=1, stop=stop)
+    stop.events    # [('regime', 1500), ('stop', 4000)]
+"""
+import numpy as np
+
+from .stats import RunningMoments
+
+
+class Convergence:
+
+    def __init__(self, block=500, rtol=0.01, atol=1e-3, patience=2, min_periods=0, regimes=True,
+                 z=3.0, batches=5):
+        self.block, self.rtol, self.atol, self.patience = block, rtol, atol, patience
+        self.z, self.batches = z, batches
+        self.min_periods, self.regimes = min_periods, regimes
+        self.events = []
+        self.reset()
+
+    def reset(self):
+        # start watching afresh, e.g. in a new regime
+        self.names, self.moments, self.previous = None, None, None
+        self.batch, self.means = None, []
+        self.settled, self.start = 0, None
+        self.diagnostics = {}
+
+    def update(self, economy):
+        # feed the period just stepped; True once the run should end
+        values = economy.indicators()
+        if self.names is None:
+            self.names = sorted(values)
+            self.moments, self.start = RunningMoments(len(self.names)), economy.t
+            self.batch = RunningMoments(len(self.names))
+        x = np.array([values[name] for name in self.names], dtype=float)
+        self.moments.update(x)
+        self.batch.update(x)
+        if self.batch.n*self.batches >= self.block or self.moments.n == self.block:
+            self.means.append(self.batch.mean)
+            self.batch = RunningMoments(len(self.names))
+        if self.moments.n < self.block:
+            return False
+        # the standard error of the block mean from the means of its batches, which
+        # are far less correlated than the periods of a persistent series
+        means = np.array(self.means)
+        mean, std = self.moments.mean, self.moments.std
+        error = means.std(axis=0, ddof=1)/np.sqrt(len(means))
+        if self.previous is not None:
+            previous, previous_error = self.previous
+            change = np.abs(mean - previous)
+            settled = change <= self.atol + self.rtol*np.abs(previous) + self.z*np.hypot(error, previous_error)
+            self.settled = self.settled + 1 if settled.all() else 0
+            self.diagnostics = dict((name, {'mean': float(mean[k]), 'std': float(std[k]), 'error': float(error[k]),
+                                            'change': float(change[k]), 'settled': bool(settled[k])})
+                                    for k, name in enumerate(self.names))
+        self.previous, self.moments, self.means = (mean, error), RunningMoments(len(self.names)), []
+        if self.settled < self.patience or economy.t - self.start < self.min_periods:
+            return False
+        policy = getattr(economy, 'policy', None)
+        if self.regimes and hasattr(policy, 'switch') and economy.t < policy.switch:
+            # end this regime now; the next one starts with the following period
+            self.events.append(('regime', economy.t))
+            policy.switch = economy.t
+            # keep a summary's before and after in step with the regimes
+            recorder = getattr(economy, 'recorder', None)
+            if hasattr(recorder, 'move_switch'):
+                recorder.move_switch(economy.t)
+            self.reset()
+            return False
+        self.events.append(('stop', economy.t))
+        return True
+
+    @property
+    def period(self):
+        # the period the run stopped at, None if it never converged
+        stops = [t for event, t in self.events if event == 'stop']
+        return stops[-1] if stops else None
@@ -0,0 +1,298 @@
+"""
+Vectorized ensemble of SimpleMacro3 economies
+Holds the state of n independent Bank/Firm/Household economies as NumPy arrays and
+moves all of them forward one period per step. Every branch of the scalar agents
+(inertia, tremble, satisficing) becomes a boolean mask over the n economies.
+"""
+import numpy as np
+
+from . import simple_macro3
+from .kernel import aspire, moves, valuate
+from .nodes import NodeArrays
+from .params import merge
+from .recorder import Recorder, RollingWindow
+from .rng import generator, run_seed, seed_sequence
+from .simple_macro3 import DEFAULT_PARAMS, SERIES, make_policy
+from .storage import CHUNK, ChunkWriter
+
+
+# uniforms drawn per economy and period by each agent type
+BANK_DRAWS, FIRM_DRAWS, HOUSEHOLD_DRAWS = 6, 7, 5
+DRAWS = BANK_DRAWS + FIRM_DRAWS + HOUSEHOLD_DRAWS
+
+# parameters that fix array shapes and so cannot vary across economies
+STRUCTURAL = ('periods', 'techs', 'irate_unit', 'irate_max')
+
+
+def per_agent(n, values):
+    # behavioural parameters may be scalars or one value per economy (or agent)
+    coerced = {}
+    for key, value in values.items():
+        if key in STRUCTURAL:
+            coerced[key] = value
+            continue
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            coerced[key] = float(value)
+        elif value.shape == (n,):
+            coerced[key] = value
+        else:
+            raise ValueError('parameter {} has shape {}, expected a scalar or ({},)'.format(key, value.shape, n))
+    return coerced
+
+
+class Banks:
+    # the decisions of the SimpleMacro3 Bank, the agent the search and step rule come from
+
+    AGENT = simple_macro3.Bank
+    probe = None    # set by instrument.attach to count decisions
+
+    def __init__(self, n, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.9, interest=0.05, periods=2, delta=0.005, min_irate=0.001):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.periods, self.delta, self.min_irate = periods, delta, min_irate
+        self.move = self.AGENT.step_rule(delta, min_irate)
+        self.lqdty, self.irate = np.zeros(n), np.full(n, interest, dtype=float)
+        self.inflation, self.price, self.output = np.zeros(n), np.ones(n), np.zeros(n)
+        self.window, self.last_price = RollingWindow(periods), np.zeros(n)
+        self.sl_output, self.sl_infltn, self.val_output, self.val_infltn = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+        self.ActionChanged = np.ones(n, dtype=bool)
+
+    def set_interest(self, households, firms, u):
+        current_irate = self.irate
+        Tremble = u[0] < self.TrblActn
+        Inertia = u[1] < self.inertia
+        if self.probe is not None:
+            self.probe.decisions('bank', Inertia, Tremble, (self.val_output >= self.sl_output) & (self.val_infltn >= self.sl_infltn))
+        move, up, down = moves(self.AGENT.SEARCH, Inertia, Tremble, ())
+        self.irate = self.move.steps(self.irate, move, up, down, u[2])
+        self.ActionChanged &= current_irate != self.irate
+        Tremble = u[3] < self.TrbSatLv
+        lamda = u[4]**self.gamma
+        self.sl_output = aspire(self.sl_output, self.val_output, Tremble, lamda, self.LAMBDA)
+        self.sl_infltn = aspire(self.sl_infltn, self.val_infltn, Tremble, lamda, self.LAMBDA)
+        households.irate = firms.irate = self.irate
+
+    def impose(self, households, firms, irate):
+        # policy override of the rate chosen in set_interest, one rate or one per economy
+        self.irate = np.broadcast_to(np.asarray(irate, dtype=float), self.irate.shape).copy()
+        households.irate = firms.irate = self.irate
+
+    def channel(self, households, firms):
+        # borrow money from household and lend it to firm
+        self.lqdty = np.minimum(households.saving, firms.capital_demand)
+        households.asset += np.maximum(0, households.saving - self.lqdty)
+        firms.capital = self.lqdty
+
+    def transfer_evaluate(self, households, firms, u):
+        # pay return from deposit and profit from firm to household
+        households.asset = 0.3 + households.asset*1.01 + (1 + self.irate)*self.lqdty + firms.profit
+        self.output = households.consumption/self.price
+        if self.window.full():
+            infltn = -(self.price - self.window.mean())**2
+        else:
+            infltn = np.zeros_like(self.price)
+        self.window.push(self.price)
+        if self.window.count <= 2:
+            self.inflation = np.zeros_like(self.price)
+        else:
+            self.inflation = (self.price - self.last_price)/self.last_price
+        self.last_price = self.price
+        # evaluate current economy in terms of consumption level and price volatility
+        rho = u[5]**self.gamma
+        self.val_output = valuate(self.val_output, self.output, self.ActionChanged, rho)
+        self.val_infltn = valuate(self.val_infltn, infltn, self.ActionChanged, rho)
+
+
+class Households:
+
+    AGENT = simple_macro3.Household
+    probe = None
+
+    def __init__(self, n, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.5, asset=5, delta=0.1, irate_unit=0.005, irate_max=0.1):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.delta, self.move = delta, self.AGENT.step_rule(delta)
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        # tables over the interest rate nodes visited by any economy
+        self.nodes = NodeArrays(int(irate_max/irate_unit), n,
+                                {'c': 0.3, 'sl_c': 0, 'val_c': 0, 'sl_asset': 0, 'val_asset': 0})
+        self.asset = np.full(n, asset, dtype=float)
+        self.price, self.saving, self.irate = np.ones(n), np.ones(n), np.ones(n)
+        self.consumption = np.ones(n)
+        self.ActionChanged = np.ones(n, dtype=bool)
+
+    def irate_node(self, irate):
+        # flat index of each economy's current node in its node tables
+        irate = np.minimum(self.irate_max - self.irate_unit, irate)
+        return self.nodes.index((irate/self.irate_unit).astype(int))
+
+    def consume(self, u):       # choose how much to consume and save
+        node = self.irate_node(self.irate)
+        tables = [self.nodes[name].take(node) for name in ('c', 'sl_c', 'val_c', 'sl_asset', 'val_asset')]
+        for name, values in zip(('c', 'sl_c', 'sl_asset'), self.choose(u, *tables)):
+            self.nodes[name].put(node, values)
+
+    def choose(self, u, c, sl_c, val_c, sl_asset, val_asset):
+        # the decision of every household from the entries of its current node and the
+        # uniforms u; sets consumption and saving and returns the new c, sl_c and sl_asset
+        Tremble = u[0] < self.TrblActn
+        Inertia = u[1] < self.inertia
+        satisficing_consumption = val_c >= sl_c
+        satisficing_asset = val_asset >= sl_asset
+        if self.probe is not None:
+            self.probe.decisions('household', Inertia, Tremble, satisficing_consumption & satisficing_asset)
+        move, up, down = moves(self.AGENT.SEARCH, Inertia, Tremble, (satisficing_consumption, satisficing_asset))
+        chosen = self.move.steps(c, move, up, down, u[2])
+        self.ActionChanged &= c != chosen
+        self.consumption = self.asset*chosen
+        self.saving = self.asset - self.consumption
+        self.asset = np.zeros_like(self.asset)
+        Tremble = u[3] < self.TrbSatLv
+        lamda = u[4]**self.gamma
+        return (chosen, aspire(sl_c, val_c, Tremble, lamda, self.LAMBDA),
+                aspire(sl_asset, val_asset, Tremble, lamda, self.LAMBDA))
+
+
+class Firms:
+
+    AGENT = simple_macro3.Firm
+    probe = None
+
+    def __init__(self, n, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5, capital_power=0.4,
+                inertia=0.9, delta=0.05, techs=[1, 1], irate_unit=0.005, irate_max=0.1, depreciate=0.05,
+                rng=None, prices=None, streams=None):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.capital, self.irate, self.profit, self.delta = np.full(n, 100.0), np.zeros(n), np.zeros(n), delta
+        self.move = self.AGENT.step_rule(delta)
+        self.techs = np.asarray(techs, dtype=float)
+        self.streams = streams
+        self.tech = self.shared(self.techs[rng.integers(len(self.techs), size=n if streams is None else streams.max() + 1)])
+        self.depreciate = depreciate
+        self.capital_power = capital_power
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.capital_demand = np.zeros(n)
+        # tables over the visited nodes; a node's initial prices are drawn from a
+        # stream of its own when it is first visited, so they do not depend on the
+        # order nodes are visited in or shift the stream of the economies' decisions
+        self.prices = seed_sequence(prices)
+        self.nodes = NodeArrays(int(irate_max/irate_unit), n, {'price': self.draw_price, 'SatLv': 0, 'Val': 0})
+        self.ActionChanged = np.ones(n, dtype=bool)
+
+    def irate_node(self, irate):
+        # flat index of each economy's current node in its node tables
+        irate = np.minimum(self.irate_max - self.irate_unit, irate)
+        return self.nodes.index((irate/self.irate_unit).astype(int))
+
+    def shared(self, values):
+        # values drawn per random stream, handed to the economies on each stream
+        return values if self.streams is None else values[..., self.streams]
+
+    def draw_price(self, nodes, width):
+        if self.streams is not None:
+            width = self.streams.max() + 1
+        return self.shared(np.array([generator(run_seed(self.prices, int(node))).uniform(0.9, 1.0, size=width) for node in nodes]))
+
+    def borrow(self, bank):
+        self.capital_demand = (self.irate/(self.capital_power*bank.price*self.tech))**(1/(self.capital_power - 1))
+
+    def set_price(self, bank, households, u):     # set price and announce it to the public
+        node = self.irate_node(self.irate)
+        current_price = self.nodes['price'].take(node)
+        Tremble = u[0] < self.TrblActn
+        Inertia = u[1] < self.inertia
+        Satisficing = self.nodes['Val'].take(node) >= self.nodes['SatLv'].take(node)
+        if self.probe is not None:
+            self.probe.decisions('firm', Inertia, Tremble, Satisficing)
+        move, up, down = moves(self.AGENT.SEARCH, Inertia, Tremble, (Satisficing,))
+        price = self.move.steps(current_price, move, up, down, u[2])
+        self.nodes['price'].put(node, price)
+        self.ActionChanged |= current_price != price
+        households.price = bank.price = np.maximum(0.01, price)
+        Tremble = u[3] < self.TrbSatLv
+        lamda = u[4]**self.gamma
+        self.nodes['SatLv'].put(node, aspire(self.nodes['SatLv'].take(node), self.nodes['Val'].take(node), Tremble, lamda, self.LAMBDA))
+
+    def produce_evaluate(self, bank, households, u):       # produce to meet demand, calculate profit and evaluate current pricing decision
+        node = self.irate_node(self.irate)
+        self.tech = self.techs[(u[5]*len(self.techs)).astype(int)]
+        capacity = bank.price*self.tech*(self.irate/(self.capital_power*bank.price*self.tech))**(self.capital_power/(self.capital_power - 1))
+        excess = np.maximum(0, households.consumption - capacity)
+        households.asset += excess
+        households.consumption = households.consumption - excess
+        self.profit = households.consumption - (self.irate + self.depreciate)*self.capital
+        rho = u[6]**self.gamma
+        val = self.nodes['Val'].take(node)
+        self.nodes['Val'].put(node, valuate(val, self.profit, self.ActionChanged, rho))
+
+
+class Ensemble:
+    # n independent SimpleMacro3 economies stepped in lockstep
+
+    def __init__(self, n, params=None, seed=None, streams=None):
+        # streams, one stream number per economy, makes the economies on one stream
+        # draw the same uniforms (common random numbers); by default each economy
+        # has a stream of its own
+        self.n, self.t = n, 0
+        self.streams = None if streams is None else np.asarray(streams, dtype=int)
+        if self.streams is not None and self.streams.shape != (n,):
+            raise ValueError('streams has shape {}, expected ({},)'.format(self.streams.shape, n))
+        self.width = n if self.streams is None else self.streams.max() + 1
+        self.params = merge(DEFAULT_PARAMS, params)
+        if self.params['schedule'] != 'period':
+            raise ValueError('only the scalar economy schedules decisions by events')
+        self.policy = make_policy(self.params['policy'])
+        self.rng = generator(seed)
+        prices = run_seed(seed, 0)
+        self.bank = Banks(n, **per_agent(n, self.params['bank']))
+        self.firm = Firms(n, rng=self.rng, prices=prices, streams=self.streams, **per_agent(n, self.params['firm']))
+        self.household = Households(n, **per_agent(n, self.params['household']))
+
+    def step(self, irate=None):
+        # one period of every economy, in the order of the SimpleMacro3.py loop;
+        # irate, when given, overrides the rate the Bank has just chosen
+        b, f, h = self.bank, self.firm, self.household
+        u = self.rng.random((DRAWS, self.width))
+        if self.streams is not None:
+            u = u[:, self.streams]
+        b.set_interest(h, f, u[:BANK_DRAWS])
+        if irate is not None:
+            b.impose(h, f, irate)
+        f.borrow(b)
+        f.set_price(b, h, u[BANK_DRAWS:BANK_DRAWS + FIRM_DRAWS])
+        h.consume(u[BANK_DRAWS + FIRM_DRAWS:])
+        b.channel(h, f)
+        f.produce_evaluate(b, h, u[BANK_DRAWS:BANK_DRAWS + FIRM_DRAWS])
+        b.transfer_evaluate(h, f, u[:BANK_DRAWS])
+        self.t += 1
+
+    def reseed(self, seed):
+        # continue on a fresh random stream, e.g. in one branch of a fork
+        self.rng = generator(seed)
+
+    def observe(self):
+        # current values of the series the Bank records
+        b, f, h = self.bank, self.firm, self.household
+        return {'price': b.price, 'profit': f.profit, 'capital': b.lqdty,
+                'consumption': b.output, 'interest': b.irate*100, 'asset': h.asset,
+                'inflation': b.inflation}
+
+    def run(self, T, series=SERIES, path=None, chunk=CHUNK):
+        # step T periods and return a (T, n) array per recorded series; with a path
+        # they are streamed to disk in chunks and returned memory-mapped
+        if path is None:
+            recorder = Recorder(T, series, width=self.n)
+        else:
+            recorder = ChunkWriter(path, series, chunk=chunk, width=self.n)
+        for s in range(T):
+            self.step(None if self.policy is None else self.policy(self.t))
+            recorder.record(**self.observe())
+        results = recorder.results()
+        if path is not None:
+            recorder.close()
+        return results
+
+
+def run_ensemble(T, n, params=None, seed=None, series=SERIES, path=None, chunk=CHUNK, streams=None):
+    # simulate n economies for T periods from a fresh state
+    return Ensemble(n, params, seed, streams).run(T, series, path, chunk)
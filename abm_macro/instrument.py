@@ -0,0 +1,152 @@
+"""
+Profiling of economies
+attach() wraps the phase methods of an economy's agents with timers and points their
+decision counters at a Probe; detach() removes both. A detached economy runs the
+plain methods and only checks `probe is None` once per decision. Phases are timed by
+self time: a phase called from another, like the Bank's evaluate from its
+transfer_evaluate, is left out of its caller's time, and step keeps only the time
+outside every phase, so the seconds of all phases add up to the time stepped.
+
+    probe = attach(economy)
+    economy.run(10000)
+    detach(economy)
+    print(probe.table())
+    probe.to_csv('profile.csv', economy.params)
+"""
+import csv
+import os
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .params import flatten
+
+
+# agent attributes of the economies, with the agent type each holds
+AGENTS = {'bank': 'bank', 'firm': 'firm', 'household': 'household',
+          'firms': 'firm', 'households': 'household'}
+
+PHASES = ('set_interest', 'borrow', 'set_price', 'consume', 'channel', 'produce_evaluate',
+          'transfer_evaluate', 'evaluate', 'produce')
+
+BRANCHES = ('inertia', 'tremble', 'satisficing', 'not_satisficing')
+
+COLUMNS = ('kind', 'name', 'count', 'seconds', 'per_call_us', 'fraction')
+
+
+def branch(inertia, tremble, satisficing):
+    # the branch an action decision takes: inertia pre-empts a tremble, which
+    # pre-empts the satisficing test
+    if inertia:
+        return 'inertia'
+    if tremble:
+        return 'tremble'
+    if satisficing:
+        return 'satisficing'
+    return 'not_satisficing'
+
+
+class Probe:
+
+    def __init__(self):
+        self.seconds, self.calls = defaultdict(float), defaultdict(int)
+        self.branches = defaultdict(int)
+        # time spent so far in phases called by the running phase
+        self.nested = 0.0
+
+    def decision(self, agent, inertia, tremble, satisficing):
+        # one agent's action decision
+        self.branches[agent, branch(inertia, tremble, satisficing)] += 1
+
+    def decisions(self, agent, inertia, tremble, satisficing):
+        # the same for arrays of agents deciding at once
+        active = ~inertia
+        trembling = active & tremble
+        satisfied = active & ~tremble & satisficing
+        counts = np.count_nonzero(inertia), np.count_nonzero(trembling), np.count_nonzero(satisfied)
+        self.branches[agent, 'inertia'] += counts[0]
+        self.branches[agent, 'tremble'] += counts[1]
+        self.branches[agent, 'satisficing'] += counts[2]
+        self.branches[agent, 'not_satisficing'] += np.size(inertia) - sum(counts)
+
+    def timed(self, name, method):
+        clock, seconds, calls = time.perf_counter, self.seconds, self.calls
+
+        def timed_method(*args, **kwargs):
+            outer, self.nested = self.nested, 0.0
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                seconds[name] += elapsed - self.nested
+                calls[name] += 1
+                self.nested = outer + elapsed
+        return timed_method
+
+    def rows(self):
+        # one row per timed phase and per agent type and branch
+        rows = []
+        for name in sorted(self.seconds):
+            calls = self.calls[name]
+            rows.append({'kind': 'phase', 'name': name, 'count': calls, 'seconds': self.seconds[name],
+                         'per_call_us': self.seconds[name]/calls*1e6 if calls else 0.0, 'fraction': ''})
+        for agent in sorted(set(agent for agent, branch in self.branches)):
+            total = sum(self.branches[agent, branch] for branch in BRANCHES)
+            for branch in BRANCHES:
+                count = self.branches[agent, branch]
+                rows.append({'kind': 'branch', 'name': agent + '.' + branch, 'count': count, 'seconds': '',
+                             'per_call_us': '', 'fraction': count/float(total) if total else 0.0})
+        return rows
+
+    def table(self):
+        # the rows as aligned text
+        line = '{:<8} {:<30} {:>12} {:>12} {:>12} {:>10}'
+        lines = [line.format(*COLUMNS)]
+        for row in self.rows():
+            cells = [row[column] if isinstance(row[column], str) else '{:.4f}'.format(row[column])
+                     for column in ('seconds', 'per_call_us', 'fraction')]
+            lines.append(line.format(row['kind'], row['name'], row['count'], *cells))
+        return '\n'.join(lines)
+
+    def to_csv(self, path, params=None, **labels):
+        # append the rows to a csv file, each tagged with the flattened parameters
+        # of the run and any extra labels such as the seed
+        tags = flatten(params or {})
+        tags.update(labels)
+        fields = sorted(tags) + list(COLUMNS)
+        new = not os.path.exists(path)
+        with open(path, 'a') as f:
+            writer = csv.DictWriter(f, fields)
+            if new:
+                writer.writeheader()
+            for row in self.rows():
+                row.update((key, tags[key]) for key in tags)
+                writer.writerow(row)
+
+
+def agents(economy):
+    return [(kind, getattr(economy, name)) for name, kind in AGENTS.items() if hasattr(economy, name)]
+
+
+def attach(economy, probe=None):
+    # start timing phases and counting decisions; returns the probe
+    probe = Probe() if probe is None else probe
+    detach(economy)
+    for kind, agent in agents(economy):
+        for phase in PHASES:
+            if hasattr(agent, phase):
+                setattr(agent, phase, probe.timed(kind + '.' + phase, getattr(agent, phase)))
+        agent.probe = probe
+    economy.step = probe.timed('step', economy.step)
+    return probe
+
+
+def detach(economy):
+    # back to the plain methods, e.g. before a snapshot
+    for kind, agent in agents(economy):
+        for phase in PHASES:
+            agent.__dict__.pop(phase, None)
+        agent.__dict__.pop('probe', None)
+    economy.__dict__.pop('step', None)
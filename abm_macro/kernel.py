@@ -0,0 +1,281 @@
+"""
+Satisficing agent kernel
+Every agent of both models takes its decisions the same way: each period it may be
+inertial and keep its action, tremble and search at random, or search because a
+valuation has fallen short of its aspiration (satisficing level); afterwards its
+aspirations drift towards its valuations, and once the period is over its valuations
+move towards the outcomes. Satisficer implements that once, for scalar agents, and
+the mask functions below do the same for arrays of agents.
+
+A model declares its agents as variants of Satisficer: the names its parameters go
+by (ALIASES), how a dissatisfied agent searches (SEARCH) and the step rule of its
+action (Integer, Additive, Proportional or Target), so a faster kernel, a new schedule or
+instrumentation reaches both scalar models at once. Only SimpleMacro3 has array
+versions (the ensemble and population models); they search as its agents declare and
+move their actions with the same step rules through steps().
+
+    class Firm(Satisficer):
+        NAME = 'firm'
+        ALIASES = {'TrblActn': 'tremble', 'TrbSatLv': 'retremble', 'LAMBDA': 'speed'}
+        SEARCH = JOINT
+"""
+from operator import ge
+
+import numpy as np
+
+
+# the direction of a search: keep the action, move it up, down or either way
+STAY, UP, DOWN, BOTH = 0, 1, 2, 3
+
+# how agents search: only when some objective falls short (JOINT); up when only the
+# first of two objectives falls short and down when only the second does
+# (DIRECTIONAL); or whenever they are not inertial (ALWAYS)
+JOINT, DIRECTIONAL, ALWAYS = 'joint', 'directional', 'always'
+
+# parameters every agent has under the kernel's names
+PARAMS = ('tremble', 'retremble', 'speed', 'gamma', 'inertia')
+
+# when agents decide: every period, drawing their inertia each time, or at events
+# separated by geometric waiting times
+SCHEDULES = ('period', 'event')
+
+
+def direction(search, inertia, tremble, satisficing):
+    # where an agent searches given its draws and whether each objective is satisfied
+    if inertia:
+        return STAY
+    if tremble or search == ALWAYS:
+        return BOTH
+    if search == DIRECTIONAL:
+        wants, keeps = satisficing
+        if wants:
+            return STAY if keeps else DOWN
+        return UP if keeps else BOTH
+    return STAY if all(satisficing) else BOTH
+
+
+def by_events(schedule):
+    # whether agents under `schedule` decide at events
+    if schedule not in SCHEDULES:
+        raise ValueError('unknown schedule {!r}, expected one of {}'.format(schedule, SCHEDULES))
+    return schedule == 'event'
+
+
+def alias(name):
+    # a model's name for the kernel parameter `name`
+    def get(self):
+        return getattr(self, name)
+
+    def set(self, value):
+        setattr(self, name, value)
+    return property(get, set)
+
+
+class Satisficer:
+    # a scalar agent with a random source `rng`
+
+    NAME = None         # reported to probes
+    ALIASES = {}        # model parameter name -> kernel parameter name
+    SEARCH = JOINT
+
+    probe = None    # set by instrument.attach to count decisions
+    events = False
+    idle = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, kernel in cls.ALIASES.items():
+            setattr(cls, name, alias(kernel))
+
+    def schedule(self, events):
+        # with events, draw the waiting time to the next decision instead of the
+        # inertia of every period
+        self.events = events
+        self.idle = self.rng.run_length(self.inertia) if events else 0
+
+    def wake(self):
+        # tremble and inertia of an event-scheduled agent this period, from the
+        # geometric waiting time between its decisions; inertial periods draw nothing
+        if self.idle > 0:
+            self.idle -= 1
+            return False, True
+        self.idle = self.rng.run_length(self.inertia)
+        return self.rng.random() < self.tremble, False
+
+    def decide(self, action, levels, values, move, ceiling=None):
+        # this period's action and satisficing levels given the current action, the
+        # levels and valuations of every objective and the step rule searched with
+        random = self.rng.random
+        if self.events:
+            Tremble, Inertia = self.wake()
+        else:
+            Tremble = random() < self.tremble
+            Inertia = random() < self.inertia
+        if self.probe is not None:
+            self.probe.decision(self.NAME, Inertia, Tremble, all(map(ge, values, levels)))
+        if not(Inertia):
+            search = self.SEARCH
+            if Tremble or search == ALWAYS:
+                way = BOTH
+            elif search == DIRECTIONAL:
+                # direction() written out for the two objectives it compares
+                wants, keeps = values[0] >= levels[0], values[1] >= levels[1]
+                way = (STAY if keeps else DOWN) if wants else (UP if keeps else BOTH)
+            else:
+                way = STAY if all(map(ge, values, levels)) else BOTH
+            if way != STAY:
+                action = move(action, way, random() if move.draws else None, ceiling)
+        u, v = random(), random()
+        # satisficing levels drift down towards values, or jump towards them on a tremble
+        lamda = v**self.gamma
+        if u < self.retremble:
+            return action, [sl + lamda*(val - sl) for sl, val in zip(levels, values)]
+        speed = lamda*self.speed
+        # written out for the usual one or two objectives, min(gap, 0) as well
+        if len(levels) == 2:
+            first, second = levels
+            gap, other = values[0] - first, values[1] - second
+            return action, (first + speed*(gap if gap < 0 else 0), second + speed*(other if other < 0 else 0))
+        if len(levels) == 1:
+            gap = values[0] - levels[0]
+            return action, (levels[0] + speed*(gap if gap < 0 else 0),)
+        return action, [sl + speed*min(val - sl, 0) for sl, val in zip(levels, values)]
+
+    def valuate(self, changed, values, outcomes):
+        # valuations restart at the outcomes of a changed action and otherwise move
+        # towards them
+        rho = self.rng.random()**self.gamma
+        if changed:
+            return outcomes
+        if len(values) == 2:
+            (value, other), (outcome, another) = values, outcomes
+            return value + rho*(outcome - value), other + rho*(another - other)
+        if len(values) == 1:
+            return (values[0] + rho*(outcomes[0] - values[0]),)
+        return [val + rho*(outcome - val) for val, outcome in zip(values, outcomes)]
+
+
+# Step rules move an action in direction `way`, within the bounds of the rule and
+# `ceiling` if given, using `draws` pre-drawn uniforms u; steps() does the same for
+# arrays of agents, moving those in `move`, only up those in `up` and only down
+# those in `down`
+
+class Integer:
+    # integer steps of up to `size`, not below floor; like random.randint
+
+    draws = 1
+
+    def __init__(self, size, floor=None):
+        self.size, self.floor = size, floor
+
+    def __call__(self, x, way, u, ceiling=None):
+        # max() and min() written out, for speed
+        lo = hi = x
+        if way != UP:
+            lo, floor = x - self.size, self.floor
+            if floor is not None and not lo > floor:
+                lo = floor
+        if way != DOWN:
+            hi = x + self.size
+            if ceiling is not None and not hi < ceiling:
+                hi = ceiling
+        lo, hi = int(lo), int(hi)
+        return lo + int(u*(hi - lo + 1))
+
+    def steps(self, x, move, up, down, u):
+        lo = x - self.size if self.floor is None else np.maximum(self.floor, x - self.size)
+        lo, hi = np.where(up, x, lo).astype(int), np.where(down, x, x + self.size).astype(int)
+        return np.where(move, lo + (u*(hi - lo + 1)).astype(int), x)
+
+
+class Additive:
+    # uniform steps of up to delta, not below floor nor above ceiling; like
+    # random.uniform
+
+    draws = 1
+
+    def __init__(self, delta, floor=None, ceiling=None):
+        self.delta, self.floor, self.ceiling = delta, floor, ceiling
+
+    def __call__(self, x, way, u, ceiling=None):
+        return self.within(x, x - self.delta, x + self.delta, way, u, ceiling)
+
+    def within(self, x, lo, hi, way, u, ceiling):
+        # a uniform step from x towards lo or hi, clipped to the floor and ceiling
+        if way == UP:
+            lo = x
+        elif self.floor is not None and not lo > self.floor:
+            lo = self.floor
+        if ceiling is None:
+            ceiling = self.ceiling
+        if way == DOWN:
+            hi = x
+        elif ceiling is not None and not hi < ceiling:
+            hi = ceiling
+        return lo + (hi - lo)*u
+
+    def bounds(self, x):
+        # the range of a search either way from every x
+        lo, hi = x - self.delta, x + self.delta
+        return (lo if self.floor is None else np.maximum(self.floor, lo),
+                hi if self.ceiling is None else np.minimum(self.ceiling, hi))
+
+    def steps(self, x, move, up, down, u):
+        lo, hi = self.bounds(x)
+        return np.where(move, uniform_range(np.where(up, x, lo), np.where(down, x, hi), u), x)
+
+
+class Proportional(Additive):
+    # uniform steps of up to a fraction delta of the action
+
+    def __call__(self, x, way, u, ceiling=None):
+        return self.within(x, x*(1 - self.delta), x*(1 + self.delta), way, u, ceiling)
+
+    def bounds(self, x):
+        lo, hi = x*(1 - self.delta), x*(1 + self.delta)
+        return (lo if self.floor is None else np.maximum(self.floor, lo),
+                hi if self.ceiling is None else np.minimum(self.ceiling, hi))
+
+
+class Target:
+    # straight to a target the agent sets before deciding, e.g. a policy rule
+
+    draws = 0
+
+    def __init__(self, target=None):
+        self.target = target
+
+    def __call__(self, x, way, u, ceiling=None):
+        return self.target
+
+    def steps(self, x, move, up, down, u):
+        return np.where(move, self.target, x)
+
+
+# the same for arrays of agents deciding at once, fed with pre-drawn uniforms
+
+def moves(search, inertia, tremble, satisficing):
+    # masks of the agents that search, and of those that may only search up or
+    # only down; the arrays counterpart of direction()
+    if search == ALWAYS:
+        return ~inertia, np.zeros_like(inertia), np.zeros_like(inertia)
+    if search == DIRECTIONAL:
+        wants, keeps = satisficing
+        move = ~inertia & (tremble | ~(wants & keeps))
+        return move, ~tremble & ~wants & keeps, ~tremble & wants & ~keeps
+    satisfied = np.logical_and.reduce(satisficing)
+    return ~inertia & (tremble | ~satisfied), np.zeros_like(inertia), np.zeros_like(inertia)
+
+
+def aspire(sl, val, tremble, lamda, LAMBDA):
+    # satisficing levels drift down towards values, or jump towards them on a tremble
+    return sl + np.where(tremble, lamda*(val - sl), lamda*LAMBDA*np.minimum(val - sl, 0))
+
+
+def valuate(val, outcome, changed, rho):
+    return np.where(changed, outcome, val + rho*(outcome - val))
+
+
+def uniform_range(lo, hi, u):
+    # random.uniform(lo, hi) fed with pre-drawn uniforms u
+    return lo + (hi - lo)*u
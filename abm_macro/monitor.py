@@ -0,0 +1,224 @@
+"""
+Live monitor of a running simulation
+A Monitor draws the recorded series while a run is still going. The simulation side
+is a Tap in place of the economy's recorder: it passes every period on to the
+recorder it wraps and forwards batches of periods over a bounded multiprocessing
+queue without ever waiting, dropping a batch if the viewer has fallen behind. The
+viewer runs in its own process and keeps, per series, only the latest `window`
+periods and the whole run averaged into at most `capacity` buckets, and redraws at
+most `fps` times a second by updating the data of existing lines.
+
+    monitor = Monitor()
+    economy = simple_macro3.Economy(seed=1)
+    monitor.attach(economy)
+    economy.run(100000)
+    monitor.close()
+
+The panels are the series the economy records, whichever model it runs, or the
+`series` given. With a path the viewer renders off screen and rewrites that image
+every frame.
+"""
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from .plotting import figure
+
+
+class Trail:
+    # one series as its last `window` values plus its whole history averaged into at
+    # most `capacity` buckets of equal length, merged pairwise when they run out
+
+    def __init__(self, window=2000, capacity=1000):
+        # an even capacity, so merging pairs never drops a bucket
+        self.window, self.capacity = window, capacity - capacity % 2
+        self.recent, self.count = np.empty(0), 0
+        self.buckets, self.used, self.size = np.empty(self.capacity), 0, 1
+        self.partial, self.filled = 0.0, 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=float)
+        self.recent = np.concatenate([self.recent, values])[-self.window:]
+        self.count += len(values)
+        position = 0
+        while position < len(values):
+            if self.filled == 0 and len(values) - position >= self.size:
+                # whole buckets at once
+                whole = (len(values) - position)//self.size
+                room = min(whole, self.capacity - self.used)
+                if room == 0:
+                    self.merge()
+                    continue
+                block = values[position:position + room*self.size]
+                self.buckets[self.used:self.used + room] = block.reshape(room, self.size).mean(axis=1)
+                self.used += room
+                position += room*self.size
+                continue
+            take = min(self.size - self.filled, len(values) - position)
+            self.partial += values[position:position + take].sum()
+            self.filled += take
+            position += take
+            if self.filled == self.size:
+                if self.used == self.capacity:
+                    self.merge()
+                if self.filled == self.size:
+                    self.buckets[self.used] = self.partial/self.size
+                    self.used += 1
+                    self.partial, self.filled = 0.0, 0
+
+    def merge(self):
+        # halve the resolution of the history
+        half = self.used//2
+        self.buckets[:half] = 0.5*(self.buckets[0:2*half:2] + self.buckets[1:2*half:2])
+        self.used, self.size = half, 2*self.size
+
+    def latest(self):
+        # periods and values of the window
+        return np.arange(self.count - len(self.recent), self.count), self.recent
+
+    def history(self):
+        # bucket midpoints and means
+        return (np.arange(self.used) + 0.5)*self.size, self.buckets[:self.used]
+
+
+def view(channel, series, window, capacity, fps, path):
+    # viewer process: drain the channel and redraw at most fps times a second until
+    # the simulation sends None
+    trails = dict((name, Trail(window, capacity)) for name in series)
+    fig, axes = figure(path, 2, (len(series) + 1)//2)
+    if path is None:
+        import matplotlib.pyplot as plt
+        plt.ion()
+        plt.show()
+    lines = {}
+    for ax, name in zip(axes, series):
+        ax.set_facecolor('white')
+        ax.set_title(name)
+        lines[name] = (ax.plot([], [], color='0.7')[0], ax.plot([], [], color='C0')[0])
+    interval, done, dirty = 1.0/fps, False, False
+    next_frame = time.monotonic()
+    while not done:
+        try:
+            batch = channel.get(timeout=max(0.0, next_frame - time.monotonic()))
+            if batch is None:
+                done = True
+            else:
+                for name, values in batch.items():
+                    trails[name].extend(values)
+                dirty = True
+        except queue.Empty:
+            pass
+        if (done or time.monotonic() >= next_frame) and dirty:
+            for name, (history, latest) in lines.items():
+                history.set_data(*trails[name].history())
+                latest.set_data(*trails[name].latest())
+                history.axes.relim()
+                history.axes.autoscale_view()
+            if path is None:
+                fig.canvas.draw_idle()
+                fig.canvas.flush_events()
+            else:
+                fig.savefig(path)
+            dirty = False
+        if time.monotonic() >= next_frame:
+            next_frame = time.monotonic() + interval
+    if path is None:
+        plt.ioff()
+        plt.show()
+
+
+class Tap:
+    # a recorder that also forwards each batch of periods to a monitor; records go on
+    # to `recorder` when given
+
+    def __init__(self, channel, series, recorder=None, batch=256):
+        self.channel, self.monitored, self.recorder, self.batch = channel, tuple(series), recorder, batch
+        # the records of the batch so far; columns are only built once per batch
+        self.pending, self.dropped, self.latest = [], 0, {}
+
+    @property
+    def series(self):
+        return self.recorder.series if self.recorder is not None else self.monitored
+
+    def record(self, **values):
+        if self.recorder is not None:
+            self.recorder.record(**values)
+        self.pending.append(values)
+        self.latest = values
+        if len(self.pending) == self.batch:
+            self.send()
+
+    def send(self):
+        # forward the buffered periods, or drop them if the viewer is behind
+        if not self.pending:
+            return
+        batch = dict((name, np.array([values[name] for values in self.pending], dtype=float))
+                     for name in self.monitored)
+        try:
+            self.channel.put_nowait(batch)
+        except queue.Full:
+            self.dropped += len(self.pending)
+        self.pending = []
+
+    def __len__(self):
+        return len(self.recorder) if self.recorder is not None else 0
+
+    def results(self):
+        return self.recorder.results() if self.recorder is not None else {}
+
+
+class Monitor:
+    # series are the panels drawn, by default every series recorded by the first
+    # recorder tapped; the viewer starts with that first tap
+
+    def __init__(self, series=None, window=2000, capacity=1000, fps=10, path=None, backlog=64):
+        self.series, self.taps, self.process = None if series is None else tuple(series), [], None
+        self.options = (window, capacity, fps, path)
+        self.channel = multiprocessing.Queue(backlog)
+        # a viewer that is gone must not hold up the exit of the simulation
+        self.channel.cancel_join_thread()
+
+    def tap(self, recorder=None, batch=256):
+        recorded = None if recorder is None else tuple(recorder.series)
+        if getattr(recorder, 'width', None) is not None:
+            raise ValueError('the monitor draws one economy; record an ensemble one economy per Monitor')
+        if self.series is None:
+            if recorded is None:
+                raise ValueError('name the series to monitor when tapping without a recorder')
+            self.series = recorded
+        elif recorded is not None and not set(self.series) <= set(recorded):
+            raise ValueError('series {} are not recorded, only {}'.format(
+                sorted(set(self.series) - set(recorded)), list(recorded)))
+        if self.process is None:
+            self.process = multiprocessing.Process(target=view, daemon=True,
+                                                   args=(self.channel, self.series) + self.options)
+            self.process.start()
+        tap = Tap(self.channel, self.series, recorder, batch)
+        self.taps.append(tap)
+        return tap
+
+    def attach(self, economy, batch=256):
+        # route the economy's records through a tap, wherever its agents hold the
+        # recorder; any economy with a recorder will do
+        recorder = getattr(economy, 'recorder', None)
+        if recorder is None:
+            raise ValueError('{} has no recorder to monitor'.format(type(economy).__name__))
+        holders = [agent for agent in vars(economy).values() if getattr(agent, 'recorder', None) is recorder]
+        tap = self.tap(recorder, batch)
+        economy.recorder = tap
+        for agent in holders:
+            agent.recorder = tap
+        return tap
+
+    def close(self, wait=True):
+        # send what the taps still hold and tell the viewer the run is over; with
+        # wait, block until its window is closed (or its last frame saved)
+        if self.process is None:
+            return
+        for tap in self.taps:
+            tap.send()
+        self.channel.put(None)
+        if wait:
+            self.process.join()
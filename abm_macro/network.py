@@ -0,0 +1,288 @@
+"""
+Network of linked SimpleMacro3 economies
+Each region is a SimpleMacro3 economy with its own Bank, Firm and Household. Its Bank
+keeps a share 1 - openness of the Household's saving for the Firm at home and offers
+the rest, with any saving the Firm does not want, to the linked regions. Offers are
+shared out among the shortfalls of a lender's links in proportion to link weight
+times shortfall, scaled down where a region would receive more than it asked for.
+Foreign loans pay the rate of the borrowing region. Offers that find no borrower
+abroad are lent at home after all, as far as the Firm still wants them, and saving
+that finds no borrower stays with the Household, as in Bank.channel. With openness
+0, or no links, a region is a SimpleMacro3 economy.
+
+Regions are partitioned across worker processes. Each worker steps its regions
+locally; the only data exchanged is every region's offer, shortfall and rate, once
+per period, through a shared array behind a barrier. Every worker then computes the
+same allocation from those, so results do not depend on the number of workers. The
+allocation costs one pass over the links, so sparse networks (rings, lattices) scale
+with the number of cores while a complete network of R regions costs R**2 per period
+in every worker.
+
+    with Network(200, links=ring(200), seed=1, workers=4) as network:
+        results = network.run(10000)       # a (T, regions) array per series
+"""
+import multiprocessing as mp
+import os
+import traceback
+
+import numpy as np
+
+from .params import merge
+from .recorder import Recorder
+from .rng import run_seed, seed_sequence
+from .simple_macro3 import DEFAULT_PARAMS, SERIES, Economy
+
+
+# series recorded per region besides those of the Bank: loans made to and taken from
+# other regions
+FLOWS = ('exported', 'imported')
+
+# offer, shortfall and rate of every region, the values exchanged each period
+EXCHANGED = 3
+
+
+def ring(n, k=1, weight=1.0):
+    # links of every region to the k nearest regions on either side of a circle
+    links = np.zeros((n, n))
+    for step in range(1, k + 1):
+        for r in range(n):
+            links[r, (r + step) % n] = links[r, (r - step) % n] = weight
+    return links
+
+
+def complete(n, weight=1.0):
+    # every region linked to every other one
+    return weight*(1 - np.eye(n))
+
+
+def edges(links):
+    # (lender, borrower, weight) arrays of the nonzero links of an (n, n) matrix
+    links = np.asarray(links, dtype=float)
+    if links.ndim != 2 or links.shape[0] != links.shape[1]:
+        raise ValueError('links must be a square matrix, got shape {}'.format(links.shape))
+    if (links < 0).any():
+        raise ValueError('links must not be negative')
+    links = links.copy()
+    np.fill_diagonal(links, 0)
+    lenders, borrowers = np.nonzero(links)
+    return lenders, borrowers, links[lenders, borrowers]
+
+
+def allocate(offer, shortfall, irate, lenders, borrowers, weights):
+    # loans made and taken and interest earned abroad by every region, from every
+    # region's offer, shortfall and rate
+    n = len(offer)
+    bids = weights*shortfall[borrowers]
+    totals = np.bincount(lenders, bids, n)
+    shares = np.divide(bids, totals[lenders], out=np.zeros_like(bids), where=totals[lenders] > 0)
+    proposed = offer[lenders]*shares
+    received = np.bincount(borrowers, proposed, n)
+    scale = np.minimum(1, np.divide(shortfall, received, out=np.ones(n), where=received > 0))
+    loans = proposed*scale[borrowers]
+    exported = np.bincount(lenders, loans, n)
+    imported = np.bincount(borrowers, loans, n)
+    earnings = np.bincount(lenders, loans*(1 + irate[borrowers]), n)
+    return exported, imported, earnings
+
+
+class Region(Economy):
+    # a SimpleMacro3 economy whose period is split around the exchange with the
+    # other regions
+
+    def __init__(self, params=None, seed=None, horizon=None, series=SERIES, openness=0.5):
+        Economy.__init__(self, params, seed, horizon, [name for name in series if name not in FLOWS])
+        self.flows = Recorder(horizon, [name for name in series if name in FLOWS])
+        self.openness = openness
+
+    def open(self):
+        # the period up to the capital market; lends the saving kept at home and
+        # returns what is offered abroad, what is left to borrow and the rate
+        b, f, h = self.bank, self.firm, self.household
+        b.set_interest(h, f)
+        if self.policy is not None:
+            b.irate = h.irate = f.irate = self.policy(self.t)
+        f.borrow(b)
+        f.set_price(b, h)
+        h.consume()
+        b.lqdty = min(h.saving*(1 - self.openness), f.capital_demand)
+        return h.saving - b.lqdty, f.capital_demand - b.lqdty, b.irate
+
+    def close(self, exported, imported, earnings):
+        # the rest of the period once exported has been lent abroad, imported
+        # borrowed from abroad and earnings is due on the loans made abroad
+        b, f, h = self.bank, self.firm, self.household
+        # offers left over go to the Firm as far as it still wants them
+        b.lqdty = min(h.saving - exported, f.capital_demand - imported)
+        h.asset += h.saving - b.lqdty - exported
+        f.capital = b.lqdty + imported
+        f.produce_evaluate(b, h)
+        h.asset = 0.3 + h.asset*(1.01) + (1 + b.irate)*b.lqdty + earnings + f.profit
+        # the Bank records all capital of the firm, at home and from abroad
+        b.lqdty = f.capital
+        b.evaluate(h.consumption/(b.price*1.0), f.profit, h.asset)
+        self.flows.record(exported=exported, imported=imported)
+        self.t += 1
+
+    def results(self):
+        results = self.recorder.results()
+        results.update(self.flows.results())
+        return results
+
+
+class Shard:
+    # the regions lo..hi-1 of a network
+
+    def __init__(self, lo, hi, params, seed, links, series, openness):
+        self.lo, self.hi, self.series = lo, hi, series
+        self.regions = [Region(params[r], run_seed(seed, r), None, series, openness[r]) for r in range(lo, hi)]
+        self.lenders, self.borrowers, self.weights = links
+
+    def open(self, out):
+        # write offer, shortfall and rate of every region into the rows of out
+        for k, region in enumerate(self.regions):
+            out[:, self.lo + k] = region.open()
+
+    def close(self, exchanged):
+        offer, shortfall, irate = exchanged
+        flows = allocate(offer, shortfall, irate, self.lenders, self.borrowers, self.weights)
+        exported, imported, earnings = (values[self.lo:self.hi].tolist() for values in flows)
+        for region, x, m, e in zip(self.regions, exported, imported, earnings):
+            region.close(x, m, e)
+
+    def results(self, start):
+        # a (periods, regions) array per series of the periods since `start`
+        results = [region.results() for region in self.regions]
+        return dict((name, np.column_stack([r[name][start:] for r in results])) for name in self.series)
+
+
+def _serve(shard_args, shared, barrier, conn):
+    # worker process: step one shard in lockstep with the others, as told by conn
+    try:
+        shard = Shard(*shard_args)
+        n = len(shared)//(2*EXCHANGED)
+        exchanged = np.frombuffer(shared, dtype=np.float64).reshape(2, EXCHANGED, n)
+        conn.send(('ready', None))
+        while True:
+            command, T = conn.recv()
+            if command == 'close':
+                break
+            start = shard.regions[0].t if shard.regions else 0
+            for s in range(T):
+                # alternate halves, so no region overwrites values still being read
+                values = exchanged[(start + s) % 2]
+                shard.open(values)
+                barrier.wait()
+                shard.close(values)
+            conn.send(('results', shard.results(start)))
+    except Exception:
+        barrier.abort()
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class Network:
+    # `regions` linked SimpleMacro3 economies stepped on `workers` processes (all
+    # cores by default; 1 steps them in this process). params is shared by every
+    # region or a list of one override per region; links is an (n, n) matrix of the
+    # weight with which region j lends to region i, a ring by default; openness, the
+    # share of saving offered abroad, is a scalar or one per region
+
+    def __init__(self, regions, links=None, params=None, seed=None, workers=None, series=SERIES + FLOWS,
+                 openness=0.5):
+        self.n, self.t, self.series = regions, 0, tuple(series)
+        if isinstance(params, (list, tuple)):
+            if len(params) != regions:
+                raise ValueError('{} parameter sets for {} regions'.format(len(params), regions))
+            self.params = [merge(DEFAULT_PARAMS, p) for p in params]
+        else:
+            self.params = [merge(DEFAULT_PARAMS, params)]*regions
+        if any(p['schedule'] != 'period' for p in self.params):
+            raise ValueError('regions schedule decisions every period')
+        # resolved here so that every worker seeds its regions alike
+        self.seed = seed_sequence(seed)
+        links = ring(regions) if links is None else links
+        if np.shape(links) != (regions, regions):
+            raise ValueError('links must be {0}x{0}, got {1}'.format(regions, np.shape(links)))
+        self.links = edges(links)
+        self.openness = np.broadcast_to(np.asarray(openness, dtype=float), (regions,)).tolist()
+        if not all(0 <= share <= 1 for share in self.openness):
+            raise ValueError('openness must lie in [0, 1]')
+        self.workers = max(1, min(workers or os.cpu_count(), regions))
+        bounds = np.linspace(0, regions, self.workers + 1).astype(int)
+        shards = [(lo, hi, self.params, self.seed, self.links, self.series, self.openness) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self.processes, self.conns = [], []
+        if self.workers == 1:
+            self.shard = Shard(*shards[0])
+            self.exchanged = np.empty((EXCHANGED, regions))
+            return
+        self.shard = None
+        shared = mp.RawArray('d', 2*EXCHANGED*regions)
+        barrier = mp.Barrier(self.workers)
+        for args in shards:
+            conn, child = mp.Pipe()
+            process = mp.Process(target=_serve, args=(args, shared, barrier, child), daemon=True)
+            process.start()
+            child.close()
+            self.processes.append(process)
+            self.conns.append(conn)
+        self._collect()
+
+    def _collect(self):
+        # one reply per worker, in shard order
+        replies = []
+        for conn in self.conns:
+            try:
+                replies.append(conn.recv())
+            except EOFError:
+                replies.append(('error', 'worker exited'))
+        errors = [value for kind, value in replies if kind == 'error']
+        if errors:
+            self.close()
+            raise RuntimeError('network worker failed:\n' + errors[0])
+        return [value for kind, value in replies]
+
+    def run(self, T):
+        # step every region T periods and return a (T, regions) array per series
+        if self.shard is not None:
+            shard = self.shard
+            start = self.t
+            for s in range(T):
+                shard.open(self.exchanged)
+                shard.close(self.exchanged)
+            results = shard.results(start)
+        else:
+            if not self.conns:
+                raise RuntimeError('network is closed')
+            for conn in self.conns:
+                conn.send(('run', T))
+            parts = self._collect()
+            results = dict((name, np.hstack([part[name] for part in parts])) for name in self.series)
+        self.t += T
+        return results
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.conns, self.processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_network(T, regions, links=None, params=None, seed=None, workers=None, series=SERIES + FLOWS,
+                openness=0.5):
+    # simulate `regions` linked economies for T periods from a fresh state
+    with Network(regions, links, params, seed, workers, series, openness) as network:
+        return network.run(T)
@@ -0,0 +1,111 @@
+"""
+Sparse tables over interest rate nodes
+Agents keep their actions, satisficing levels and values per interest rate node, but
+the Bank's random walk only ever visits a narrow band of rates. A node table maps the
+nodes visited so far to slots of compact arrays and materializes a node the first
+time it is visited, so memory follows the visited band rather than
+irate_max/irate_unit. Every column of a table shares the slot map and is a separate
+array.
+
+Columns are declared with an initial value per node: a number, or a callable that
+draws one (NodeTable) or the (nodes, width) rows of the given nodes (NodeArrays).
+"""
+from array import array
+
+import numpy as np
+
+
+class NodeTable:
+    # per-node columns of a scalar agent; column arrays keep their identity as they
+    # grow, so agents may hold them as attributes and index them by slot
+
+    def __init__(self, columns):
+        self.initial = dict(columns)
+        self.columns = dict((name, array('d')) for name in self.initial)
+        self.slots = {}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slot(self, node):
+        # the slot of node in every column, materialized on first visit
+        slot = self.slots.get(node)
+        if slot is None:
+            slot = self.slots[node] = len(self.slots)
+            for name, column in self.columns.items():
+                initial = self.initial[name]
+                column.append(initial() if callable(initial) else initial)
+        return slot
+
+    def value(self, name, node):
+        return self.columns[name][self.slot(node)]
+
+    def dense(self, name, nodes, fill=np.nan):
+        # the column over nodes 0..nodes-1, with fill at nodes never visited
+        values = np.full(nodes, fill)
+        column = self.columns[name]
+        for node, slot in self.slots.items():
+            values[node] = column[slot]
+        return values
+
+
+class NodeArrays:
+    # per-node columns of `width` agents or economies, stored slot-major so a node's
+    # row is contiguous; columns are reallocated as they grow, so look them up by
+    # name after materializing nodes rather than holding on to them
+
+    def __init__(self, nodes, width, columns, capacity=4):
+        self.initial = dict(columns)
+        self.width, self.used = width, 0
+        # slot of every node, -1 until it is visited
+        self.lookup = np.full(nodes, -1, dtype=np.intp)
+        self.columns = dict((name, np.empty((capacity, width))) for name in self.initial)
+        self.offsets = np.arange(width)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return self.used
+
+    def _materialize(self, nodes):
+        # give the unvisited nodes among `nodes` the next free slots
+        nodes = np.unique(nodes)
+        count = len(nodes)
+        capacity = len(next(iter(self.columns.values())))
+        if self.used + count > capacity:
+            capacity = max(2*capacity, self.used + count)
+            for name, column in self.columns.items():
+                grown = np.empty((capacity, self.width))
+                grown[:self.used] = column[:self.used]
+                self.columns[name] = grown
+        rows = slice(self.used, self.used + count)
+        for name, column in self.columns.items():
+            initial = self.initial[name]
+            column[rows] = initial(nodes, self.width) if callable(initial) else initial
+        self.lookup[nodes] = np.arange(self.used, self.used + count)
+        self.used += count
+
+    def row(self, node):
+        # the slot of one node shared by all agents
+        if self.lookup[node] < 0:
+            self._materialize([node])
+        return int(self.lookup[node])
+
+    def index(self, nodes):
+        # flat indices into the columns of each economy's own node
+        slots = self.lookup[nodes]
+        if (slots < 0).any():
+            self._materialize(nodes[slots < 0])
+            slots = self.lookup[nodes]
+        return slots*self.width + self.offsets
+
+    def dense(self, name, fill=np.nan):
+        # the column as a (nodes, width) array, with fill at nodes never visited
+        values = np.full((len(self.lookup), self.width), fill)
+        visited = self.lookup >= 0
+        values[visited] = self.columns[name][self.lookup[visited]]
+        return values
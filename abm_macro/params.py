@@ -0,0 +1,37 @@
+"""
+Model parameters
+Parameters are nested dicts, one entry per agent ('bank', 'firm', 'household') holding
+its constructor keywords, plus a 'policy' entry where the model has one. Overrides may
+use the same nesting or dotted keys such as 'firm.inertia'.
+"""
+import copy
+
+
+def merge(defaults, params=None):
+    # a deep copy of defaults with params laid over it
+    merged = copy.deepcopy(defaults)
+    for key, value in (params or {}).items():
+        if '.' in key:
+            agent, name = key.split('.', 1)
+            value = {name: value}
+        else:
+            agent = key
+        if agent not in merged:
+            raise KeyError('unknown parameter group {!r}'.format(agent))
+        if isinstance(value, dict) and isinstance(merged[agent], dict):
+            merged[agent].update(copy.deepcopy(value))
+        else:
+            merged[agent] = copy.deepcopy(value)
+    return merged
+
+
+def flatten(params):
+    # {'firm': {'inertia': 0.9}} -> {'firm.inertia': 0.9}
+    flat = {}
+    for agent, values in params.items():
+        if isinstance(values, dict):
+            for name, value in values.items():
+                flat[agent + '.' + name] = value
+        else:
+            flat[agent] = values
+    return flat
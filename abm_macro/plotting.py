@@ -0,0 +1,75 @@
+"""
+Plots of simulated series
+matplotlib is imported only when a figure is drawn. With a path the figure is rendered
+off screen and saved, so no display is needed; without one it is shown with pyplot.
+Saved figures draw each series at the resolution of the axes (see views): block means
+inside the min/max envelope of the blocks, so export time does not grow with the
+length of the run. Passing a View instead of results reuses the levels it has
+computed for earlier figures.
+"""
+from .views import View, pixel_width
+
+
+def figure(path, nrows, ncols, figsize=(12, 8)):
+    if path is None:
+        import matplotlib.pyplot as plt
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize)
+    else:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize)
+        axes = fig.subplots(nrows, ncols)
+    fig.subplots_adjust(left=None, bottom=None, right=None, top=None, wspace=0.2, hspace=0.2)
+    return fig, list(axes.flat)
+
+
+def finish(fig, path):
+    if path is None:
+        import matplotlib.pyplot as plt
+        plt.show()
+    else:
+        fig.savefig(path)
+
+
+def draw(ax, view, name, path, *args, **kwargs):
+    # the whole series on screen, where it can be zoomed; its level of detail
+    # fitting the axes when saved
+    if path is None:
+        return ax.plot(view.results[name], *args, **kwargs)
+    periods, mean, low, high = view.level(name, pixel_width(ax))
+    lines = ax.plot(periods, mean, *args, **kwargs)
+    if len(mean) < len(view.results[name]):
+        ax.fill_between(periods, low, high, color=lines[0].get_color(), alpha=0.3, linewidth=0)
+    return lines
+
+
+def plot_simple_macro(results, path=None):
+    # inflation, interest, consumption and real asset of a SimpleMacro run, given as
+    # its results or a View of them
+    names = ['inflation', 'interest', 'consumption', 'asset']
+    ylims = [[-.5, .5], [0, 30], [0, 60], [0, 200000]]
+    plot_args = {'markersize': 8, 'alpha': 0.6}
+    fig, axes = figure(path, 2, 2)
+    view = results if isinstance(results, View) else View(results)
+    for ax, name, ylim in zip(axes, names, ylims):
+        ax.set_facecolor('white')
+        draw(ax, view, name, path, 'o', markerfacecolor='orange', **plot_args)
+        ax.set_title(name)
+        ax.set_ylim(ylim)
+    finish(fig, path)
+    return fig
+
+
+def plot_simple_macro3(results, path=None):
+    # the six series recorded by the Bank of a SimpleMacro3 run, given as its
+    # results or a View of them
+    names = ['price', 'profit', 'capital', 'consumption', 'interest', 'asset']
+    titles = ['Price', 'Profit', 'Capital', 'Consumption', 'Nominal Interest', 'Asset']
+    fig, axes = figure(path, 2, 3)
+    view = results if isinstance(results, View) else View(results)
+    for ax, name, title in zip(axes, names, titles):
+        ax.set_facecolor('white')
+        draw(ax, view, name, path)
+        ax.set_title(title)
+    axes[0].set_ylim([0, 1.2])
+    finish(fig, path)
+    return fig
@@ -0,0 +1,32 @@
+"""
+Interest rate policy paths imposed on the Bank
+"""
+
+
+class StepPolicy:
+    # fix the nominal interest rate at `before` until period `switch`, then at `after`
+    # (the experiment hard-coded in SimpleMacro3.py)
+
+    def __init__(self, switch=5000, before=0.05, after=0.08):
+        self.switch, self.before, self.after = switch, before, after
+
+    def __call__(self, t):
+        if t < self.switch:
+            return self.before
+        return self.after
+
+    def __repr__(self):
+        return 'StepPolicy(switch={}, before={}, after={})'.format(self.switch, self.before, self.after)
+
+
+class ConstantPolicy:
+    # fix the rate at `rate`, a scalar or one rate per economy of an ensemble
+
+    def __init__(self, rate=0.05):
+        self.rate = rate
+
+    def __call__(self, t):
+        return self.rate
+
+    def __repr__(self):
+        return 'ConstantPolicy(rate={})'.format(self.rate)
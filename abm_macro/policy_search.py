@@ -0,0 +1,131 @@
+"""
+Search for the Bank's interest rate rule
+A TaylorRule sets every economy's rate from its output and inflation of the last
+period, alpha_i*output + alpha_infl*inflation, the rule of the Bank of SimpleMacro.py
+with the coefficients commented out in SimpleMacro3.py. A PolicySearch scores
+candidate coefficient pairs by the Bank's own objectives, its valuations val_output
+and val_infltn averaged over the periods after a burn-in and over a fixed set of
+seeds, and returns their Pareto frontier.
+
+All candidates x seeds run as one Ensemble in which every candidate draws the
+uniforms of the same seeds, so candidates are compared on common random numbers.
+The search is successive halving: every candidate runs a short horizon, dominated
+candidates are dropped front by front until about 1/eta of them are left, and the
+survivors run again on an eta times longer horizon, up to T.
+
+    search = PolicySearch(points=16, T=5000, replications=8)
+    fit = search.run()
+    fit['frontier']     # [{'alpha_i': ..., 'alpha_infl': ..., 'val_output': ..., 'val_infltn': ...}, ...]
+"""
+import numpy as np
+
+from .ensemble import Ensemble
+from .params import merge
+from .rng import seed_sequence
+from .simple_macro3 import DEFAULT_PARAMS
+
+
+# the Bank's objectives, maximized
+OBJECTIVES = ('val_output', 'val_infltn')
+
+
+class TaylorRule:
+    # alpha_i*output + alpha_infl*inflation of the last period, within [floor, cap];
+    # the coefficients are scalars or one per economy
+
+    def __init__(self, alpha_i, alpha_infl, floor=0.001, cap=0.1, initial=0.05):
+        self.alpha_i, self.alpha_infl = alpha_i, alpha_infl
+        self.floor, self.cap, self.initial = floor, cap, initial
+
+    def __call__(self, t, bank):
+        if t == 0:
+            return self.initial
+        return np.clip(self.alpha_i*bank.output + self.alpha_infl*bank.inflation, self.floor, self.cap)
+
+    def __repr__(self):
+        return 'TaylorRule(alpha_i={}, alpha_infl={})'.format(self.alpha_i, self.alpha_infl)
+
+
+def dominated(scores):
+    # mask of the rows of (candidates, objectives) scores that some other row beats
+    # on one objective without losing on any
+    geq = (scores[:, None, :] >= scores[None, :, :]).all(axis=2)
+    gt = (scores[:, None, :] > scores[None, :, :]).any(axis=2)
+    return (geq & gt).any(axis=0)
+
+
+def fronts(scores):
+    # the Pareto front of every row: 0 for the frontier, 1 for the frontier of the
+    # rest and so on
+    front = np.full(len(scores), -1)
+    rest, k = np.arange(len(scores)), 0
+    while len(rest):
+        beaten = dominated(scores[rest])
+        front[rest[~beaten]] = k
+        rest, k = rest[beaten], k + 1
+    return front
+
+
+class PolicySearch:
+
+    def __init__(self, alpha_i=(0.0, 0.04), alpha_infl=(0.0, 2.0), points=16, candidates=None,
+                 params=None, T=5000, replications=8, seed=0, eta=3, rungs=3, burn=0.5):
+        # candidates, an array of (alpha_i, alpha_infl) rows, replaces the grid of
+        # points x points over the bounds; the rule replaces any policy path
+        if candidates is None:
+            grid = np.meshgrid(np.linspace(alpha_i[0], alpha_i[1], points),
+                               np.linspace(alpha_infl[0], alpha_infl[1], points), indexing='ij')
+            candidates = np.column_stack([axis.ravel() for axis in grid])
+        self.candidates = np.asarray(candidates, dtype=float)
+        self.params = merge(DEFAULT_PARAMS, params)
+        self.params['policy'] = None
+        self.T, self.replications, self.eta, self.rungs, self.burn = T, replications, eta, rungs, burn
+        # resolved here so that every rung runs on the same seeds
+        self.seed = seed_sequence(seed)
+        self.evaluations = 0
+
+    def rule(self, candidates):
+        bank, household = self.params['bank'], self.params['household']
+        return TaylorRule(candidates[:, 0], candidates[:, 1], floor=bank['min_irate'],
+                          cap=household['irate_max'], initial=bank['interest'])
+
+    def evaluate(self, candidates, T):
+        # (candidates, objectives) means over seeds of the objectives averaged over
+        # the periods after the burn-in, and their standard errors
+        n, S = len(candidates), self.replications
+        economy = Ensemble(n*S, self.params, self.seed, streams=np.tile(np.arange(S), n))
+        rule = self.rule(np.repeat(candidates, S, axis=0))
+        b, start = economy.bank, int(T*self.burn)
+        totals = np.zeros((len(OBJECTIVES), n*S))
+        for t in range(T):
+            economy.step(rule(t, b))
+            if t >= start:
+                totals[0] += b.val_output
+                totals[1] += b.val_infltn
+        self.evaluations += n*S*T
+        means = (totals/(T - start)).reshape(len(OBJECTIVES), n, S)
+        errors = means.std(axis=2, ddof=1)/np.sqrt(S) if S > 1 else np.zeros((len(OBJECTIVES), n))
+        return means.mean(axis=2).T, errors.T
+
+    def run(self, progress=None):
+        # successive halving over the candidates; the frontier of the last rung
+        alive, history = np.arange(len(self.candidates)), []
+        for rung in range(self.rungs):
+            T = max(1, self.T//self.eta**(self.rungs - 1 - rung))
+            scores, errors = self.evaluate(self.candidates[alive], T)
+            history.append((T, alive, scores, errors))
+            if progress is not None:
+                progress(rung, T, len(alive))
+            if rung == self.rungs - 1:
+                break
+            # keep whole fronts until at least 1/eta of the candidates are kept
+            front = fronts(scores)
+            keep = -(-len(alive)//self.eta)
+            last = np.sort(front)[keep - 1]
+            alive = alive[front <= last]
+        on_frontier = fronts(scores) == 0
+        frontier = [dict(alpha_i=float(a), alpha_infl=float(p), val_output=float(o), val_infltn=float(i))
+                    for (a, p), (o, i) in zip(self.candidates[alive][on_frontier], scores[on_frontier])]
+        frontier.sort(key=lambda point: point['val_output'])
+        return {'frontier': frontier, 'candidates': self.candidates[alive], 'scores': scores,
+                'errors': errors, 'evaluations': self.evaluations, 'history': history}
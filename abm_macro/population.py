@@ -0,0 +1,226 @@
+"""
+SimpleMacro3 economy with many heterogeneous households and firms
+One Bank sets the interest rate for H households and F firms. Every household has its
+own consumption table over interest rate nodes and is the customer of one firm,
+assigned round robin so that every firm has customers; every firm has its own price
+table. A firm borrows from its own customers, who lend in proportion to their saving,
+sells to them and pays its profit back to them in proportion to what they lent it.
+Its capital demand and capacity are those of the SimpleMacro3 Firm per customer, so a
+firm with c customers runs the markets of c SimpleMacro3 economies pooled at one
+price, and with one household per firm every pair runs the markets of SimpleMacro3.py.
+The markets clear as array aggregations over firms, so a period costs O(H + F).
+
+Since all agents face the Bank's single rate, they share one node each period, and
+the node tables are stored node-major so that node's row is a contiguous slice.
+As in independent SimpleMacro3 economies, the customers of the odd firm whose demand
+for capital collapses see their saving compound, so aggregate assets are best
+summarized by their median.
+"""
+import numpy as np
+
+from . import ensemble, simple_macro3
+from .ensemble import per_agent
+from .kernel import aspire, moves, valuate
+from .nodes import NodeArrays
+from .params import merge
+from .recorder import Recorder
+from .rng import agent_sources
+from .simple_macro3 import DEFAULT_PARAMS, SERIES, Bank, make_policy
+from .storage import CHUNK, ChunkWriter
+
+
+class Households(ensemble.Households):
+    # the decisions of ensemble.Households, with every household on the Bank's node
+
+    probe = None    # set by instrument.attach to count decisions
+
+    def __init__(self, n, firms, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.5, asset=5, delta=0.1, irate_unit=0.005, irate_max=0.1, rng=None):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.delta, self.move, self.rng, self.n = delta, self.AGENT.step_rule(delta), rng, n
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        if n < firms:
+            raise ValueError('{} households cannot all be customers of {} firms'.format(n, firms))
+        # the firm each household buys from, lends to and owns part of
+        self.firm = np.arange(n) % firms
+        self.customers = np.bincount(self.firm, minlength=firms)
+        self.asset = np.full(n, asset, dtype=float)
+        self.price, self.saving, self.lent, self.irate = np.ones(n), np.ones(n), np.zeros(n), 1
+        self.consumption = np.ones(n)
+        # tables over the visited interest rate nodes, one row per node
+        self.nodes = NodeArrays(int(irate_max/irate_unit), n,
+                                {'c': 0.3, 'sl_c': 0, 'val_c': 0, 'sl_asset': 0, 'val_asset': 0})
+        self.ActionChanged = np.ones(n, dtype=bool)
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)
+
+    def consume(self):       # choose how much to consume and save
+        row = self.nodes.row(self.irate_node(self.irate))
+        u = self.rng.uniforms(5*self.n).reshape(5, self.n)
+        tables = [self.nodes[name][row] for name in ('c', 'sl_c', 'val_c', 'sl_asset', 'val_asset')]
+        for name, values in zip(('c', 'sl_c', 'sl_asset'), self.choose(u, *tables)):
+            self.nodes[name][row] = values
+
+
+class Firms:
+
+    AGENT = simple_macro3.Firm
+    probe = None
+
+    def __init__(self, n, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5, capital_power=0.4,
+                inertia=0.9, delta=0.05, techs=[1, 1], irate_unit=0.005, irate_max=0.1, depreciate=0.05,
+                rng=None, customers=1):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.capital, self.irate, self.profit, self.delta = np.full(n, 100.0), 0, np.zeros(n), delta
+        self.move = self.AGENT.step_rule(delta)
+        self.rng, self.n = rng, n
+        self.techs = np.asarray(techs, dtype=float)
+        self.tech = self.techs[(rng.uniforms(n)*len(self.techs)).astype(int)]
+        self.depreciate = depreciate
+        self.capital_power = capital_power
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.capital_demand, self.sales = np.zeros(n), np.zeros(n)
+        # demand for capital and capacity scale with the households a firm serves
+        self.customers = customers
+        # posted prices of the last period; borrowing is planned at these
+        self.posted = np.ones(n)
+        # tables over the visited nodes; prices are drawn as nodes are first visited
+        self.nodes = NodeArrays(int(irate_max/irate_unit), n, {'price': self.draw_price, 'SatLv': 0, 'Val': 0})
+        self.ActionChanged = np.ones(n, dtype=bool)
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)
+
+    def draw_price(self, nodes, width):
+        return 0.9 + 0.1*self.rng.uniforms(len(nodes)*width).reshape(len(nodes), width)
+
+    def borrow(self):
+        self.capital_demand = self.customers*(self.irate/(self.capital_power*self.posted*self.tech))**(1/(self.capital_power - 1))
+
+    def set_price(self):     # set price and announce it to the public
+        row = self.nodes.row(self.irate_node(self.irate))
+        u = self.rng.uniforms(5*self.n).reshape(5, self.n)
+        price, SatLv, Val = [self.nodes[name][row] for name in ('price', 'SatLv', 'Val')]
+        current_price = price.copy()
+        Tremble = u[0] < self.TrblActn
+        Inertia = u[1] < self.inertia
+        Satisficing = Val >= SatLv
+        if self.probe is not None:
+            self.probe.decisions('firm', Inertia, Tremble, Satisficing)
+        move, up, down = moves(self.AGENT.SEARCH, Inertia, Tremble, (Satisficing,))
+        price[:] = self.move.steps(current_price, move, up, down, u[2])
+        self.ActionChanged |= current_price != price
+        self.posted = np.maximum(0.01, price)
+        Tremble = u[3] < self.TrbSatLv
+        lamda = u[4]**self.gamma
+        SatLv[:] = aspire(SatLv, Val, Tremble, lamda, self.LAMBDA)
+
+    def produce(self):
+        # tech shocks and the output each firm can sell at the current rate
+        self.tech = self.techs[(self.rng.uniforms(self.n)*len(self.techs)).astype(int)]
+        return self.customers*self.posted*self.tech*(self.irate/(self.capital_power*self.posted*self.tech))**(self.capital_power/(self.capital_power - 1))
+
+    def evaluate(self):
+        row = self.nodes.row(self.irate_node(self.irate))
+        self.profit = self.sales - (self.irate + self.depreciate)*self.capital
+        rho = self.rng.uniforms(self.n)**self.gamma
+        Val = self.nodes['Val'][row]
+        Val[:] = valuate(Val, self.profit, self.ActionChanged, rho)
+
+
+def clear_capital(bank, households, firms):
+    # every firm borrows min(its customers' saving, its demand); its customers are
+    # rationed in proportion to their saving
+    supply = np.bincount(households.firm, weights=households.saving, minlength=firms.n)
+    firms.capital = np.minimum(supply, firms.capital_demand)
+    lent = np.divide(firms.capital, supply, out=np.zeros_like(supply), where=supply > 0)
+    households.lent = households.saving*lent[households.firm]
+    households.asset += households.saving - households.lent
+    bank.lqdty = firms.capital.sum()
+
+
+def clear_goods(households, firms, capacity):
+    # each firm serves min(demand, capacity); its customers are rationed in proportion
+    # to their demand and keep what they could not spend
+    demand = np.bincount(households.firm, weights=households.consumption, minlength=firms.n)
+    served = np.minimum(1.0, np.divide(capacity, demand, out=np.ones_like(demand), where=demand > 0))
+    bought = households.consumption*served[households.firm]
+    households.asset += households.consumption - bought
+    households.consumption = bought
+    firms.sales = demand*served
+
+
+def pay_profits(households, firms):
+    # every firm's profit goes to its customers in proportion to what they lent it,
+    # or in equal parts when it borrowed nothing; so a customer's share of the cost of
+    # capital never exceeds what it lent
+    capital = firms.capital[households.firm]
+    equal = 1.0/households.customers[households.firm]
+    share = np.divide(households.lent, capital, out=equal, where=capital > 0)
+    return share*firms.profit[households.firm]
+
+
+class Population:
+    # one Bank, F firms and H households stepped through the loop of SimpleMacro3.py
+
+    def __init__(self, households=10000, firms=100, params=None, seed=None, horizon=None,
+                 series=SERIES, recorder=None):
+        self.params = merge(DEFAULT_PARAMS, params)
+        if self.params['schedule'] != 'period':
+            raise ValueError('only the scalar economy schedules decisions by events')
+        self.seed = seed
+        rng = agent_sources(seed)
+        self.recorder = Recorder(horizon, series) if recorder is None else recorder
+        self.bank = Bank(rng=rng['bank'], recorder=self.recorder, **self.params['bank'])
+        self.households = Households(households, firms, rng=rng['household'], **per_agent(households, self.params['household']))
+        self.firms = Firms(firms, rng=rng['firm'], customers=self.households.customers, **per_agent(firms, self.params['firm']))
+        self.policy = make_policy(self.params['policy'])
+        self.t = 0
+
+    def step(self):
+        b, f, h = self.bank, self.firms, self.households
+        b.set_interest(h, f)
+        if self.policy is not None:
+            b.irate = h.irate = f.irate = self.policy(self.t)
+        f.borrow()
+        f.set_price()
+        # households pay their own firm's price; the Bank sees the customer-weighted level
+        h.price = f.posted[h.firm]
+        b.price = h.price.mean()
+        h.consume()
+        clear_capital(b, h, f)
+        clear_goods(h, f, f.produce())
+        f.evaluate()
+        # pay return from deposit and every firm's profit to its own customers
+        h.asset = 0.3 + h.asset*1.01 + (1 + b.irate)*h.lent + pay_profits(h, f)
+        b.evaluate((h.consumption/h.price).sum(), f.profit.sum(), h.asset.sum())
+        self.t += 1
+
+    def run(self, T):
+        # step T more periods and return everything recorded so far
+        for t in range(T):
+            self.step()
+        return self.results()
+
+    def results(self):
+        return self.recorder.results()
+
+    def reseed(self, seed):
+        # continue on fresh random streams, e.g. in one branch of a fork
+        self.seed = seed
+        rng = agent_sources(seed)
+        self.bank.rng, self.firms.rng, self.households.rng = rng['bank'], rng['firm'], rng['household']
+
+
+def run_population(T, households=10000, firms=100, params=None, seed=None, series=SERIES,
+                   path=None, chunk=CHUNK):
+    # simulate T periods and return the aggregate series recorded by the Bank
+    recorder = None if path is None else ChunkWriter(path, series, chunk=chunk)
+    economy = Population(households, firms, params, seed, T, series, recorder)
+    results = economy.run(T)
+    if recorder is not None:
+        recorder.close()
+    return results
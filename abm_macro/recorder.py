@@ -0,0 +1,96 @@
+"""
+History of simulated series
+A Recorder writes each period's values into NumPy columns preallocated for the
+horizon of the run, and a RollingWindow keeps the last few prices with a running sum
+so their mean costs O(1) per period.
+"""
+import numpy as np
+
+
+class RollingWindow:
+    # the last `size` values pushed, with their sum kept up to date; values may be
+    # scalars or arrays of one value per economy
+
+    # pushes between exact recomputations of the running sum, against rounding drift
+    RESYNC = 1 << 16
+
+    def __init__(self, size, fill=None):
+        self.size, self.position = size, 0
+        if fill is None:
+            self.values, self.count, self.total = [0.0]*size, 0, 0.0
+        else:
+            self.values, self.count, self.total = [fill]*size, size, fill*size
+
+    def push(self, value):
+        self.total = self.total + value - self.values[self.position]
+        self.values[self.position] = value
+        self.position = (self.position + 1) % self.size
+        self.count += 1
+        if self.count % self.RESYNC == 0:
+            self.total = sum(self.values)
+
+    def full(self):
+        return self.count >= self.size
+
+    def mean(self):
+        return self.total/float(self.size)
+
+    def __getitem__(self, k):
+        # window[-1] is the latest value, window[-size] the oldest
+        if not -self.size <= k < 0:
+            raise IndexError('window index {} out of range'.format(k))
+        return self.values[(self.position + k) % self.size]
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+
+class Recorder:
+    # typed columns for the chosen series, preallocated for `horizon` periods and
+    # doubled if a run goes beyond it; with width each period records one value per
+    # economy of an ensemble
+
+    def __init__(self, horizon=None, series=(), dtypes=None, width=None):
+        self.series = tuple(series)
+        self.dtypes = dict.fromkeys(self.series, np.float64)
+        self.dtypes.update(dtypes or {})
+        self.width, self.n = width, 0
+        # the values of the latest period, recorded or not
+        self.latest = {}
+        self.capacity = horizon if horizon else 1024
+        self.columns = dict((name, self._allocate(name, self.capacity)) for name in self.series)
+
+    def _allocate(self, name, length):
+        shape = (length,) if self.width is None else (length, self.width)
+        return np.empty(shape, dtype=self.dtypes[name])
+
+    def _grow(self):
+        self.capacity = 2*self.capacity or 1024
+        for name, column in self.columns.items():
+            grown = self._allocate(name, self.capacity)
+            grown[:self.n] = column[:self.n]
+            self.columns[name] = grown
+
+    def record(self, **values):
+        # values of this period; series that are not recorded are ignored
+        if self.n == self.capacity:
+            self._grow()
+        n = self.n
+        for name, column in self.columns.items():
+            column[n] = values[name]
+        self.n = n + 1
+        self.latest = values
+
+    def __len__(self):
+        return self.n
+
+    def __getstate__(self):
+        # pickle the recorded periods only, not the rest of the preallocated horizon
+        state = dict(self.__dict__)
+        state['columns'] = dict((name, column[:self.n].copy()) for name, column in self.columns.items())
+        state['capacity'] = self.n
+        return state
+
+    def results(self):
+        # the recorded part of every column
+        return dict((name, column[:self.n]) for name, column in self.columns.items())
@@ -0,0 +1,423 @@
+"""
+The original scalar loops
+The agents and main loops of SimpleMacro.py and SimpleMacro3.py as first written,
+drawing every uniform with its own numpy.random call and keeping the series in
+growing lists, without plotting. They are the yardstick of the benchmarks: bench
+reports every case as a ratio to them, which carries across machines. Changed only
+as far as needed to run: Python 3 print and division, numpy.mean for scipy.mean,
+the period and initial rate handed to the Bank of SimpleMacro.py instead of read
+from globals, and the Firm of SimpleMacro.py starting with ActionChanged set.
+"""
+import random
+from math import log
+from random import choice, randint
+from random import uniform as uniform_range
+
+import numpy as np
+from numpy import mean
+from numpy.random import uniform
+
+
+# SimpleMacro.py
+
+class Bank:
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5,interest=10,Periods=2,StepSize=10,initial_interest=10):
+        self.TrblProbAction,self.TrblProbSatLv,self.Lambda, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.Wfr, self.Stbl, self.liquidity, self.interest, self.recent_prices, self.StepSize = 0, 0, 0, interest, [1 for t in range(Periods)], StepSize
+        self.inflation = log(self.recent_prices[-1])-log(self.recent_prices[-2])
+        self.SatLvWfr, self.SatLvStbl, self.ValWfr, self.ValStbl = 0, 0, 0, 0
+        self.ActionChanged = True
+        self.initial_interest = initial_interest
+
+    def set_interest(self,household,firm,t,alpha_i=0.5,alpha_infl=0.5):
+        self.inflation = log(self.recent_prices[-1])-log(self.recent_prices[-2])
+        CurrentRate = self.interest
+        self.alpha_i, self.alpha_infl = alpha_i, alpha_infl # Policy maker preferences in Taylor rules
+        Tremble = uniform() < self.TrblProbAction
+        Inertia = uniform() < self.inertia
+        Satisficing_Wfr = self.ValWfr >= self.SatLvWfr
+        Satisficing_Stbl = self.ValStbl >= self.SatLvStbl
+        if not(Inertia):
+            if not(Tremble):
+                if (not(Satisficing_Wfr) or not(Satisficing_Stbl)):
+                        if t == 0:
+                            self.interest = self.initial_interest
+                        else:
+                            self.interest = max(0,alpha_i*household.cons+alpha_infl*(self.inflation))
+            else:
+                    if t == 0:
+                        self.interest = self.initial_interest
+                    else:
+                        self.interest = max(0,alpha_i*household.cons+alpha_infl*self.inflation)
+
+        if CurrentRate == self.interest:
+            self.ActionChanged = False
+
+        Tremble = uniform() < self.TrblProbSatLv
+        lamda = uniform()**self.gamma
+
+        if not(Tremble):
+            self.SatLvWfr += lamda*self.Lambda*min(self.ValWfr - self.SatLvWfr, 0)
+            self.SatLvStbl += lamda*self.Lambda*min(self.ValStbl - self.SatLvStbl, 0)
+        else:
+            self.SatLvWfr += lamda*(self.ValWfr-self.SatLvWfr)
+            self.SatLvStbl += lamda*(self.ValStbl-self.SatLvStbl)
+
+        household.interest, firm.interest = self.interest, self.interest
+
+    def channel(self,household,firm): # borrow money from household and lend it to firm
+        self.liquidity = household.saving
+        firm.captial = self.liquidity
+
+    def transfer_evaluate(self,household,firm):
+        household.asset = (1 + self.interest/1000.0)*self.liquidity + firm.profit
+
+        self.Wfr = household.cons
+        self.Stbl = -(firm.price - mean(self.recent_prices))**2
+        self.recent_prices.pop(0)
+        self.recent_prices.append(firm.price)
+
+        rho = uniform()**self.gamma
+        if not(self.ActionChanged):
+            self.ValWfr += rho*(self.Wfr - self.ValWfr)
+            self.ValStbl += rho*(self.Stbl - self.ValStbl)
+        else:
+            self.ValWfr, self.ValStbl = self.Wfr, self.Stbl
+
+
+class Household:
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5,asset=1000, cons=20, StepSize=10):
+        self.TrblProbAction,self.TrblProbSatLv,self.Lambda, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.asset, self.price, self.cons, self.saving, self.interest, self.StepSize = asset, 0, cons, 0, 0, StepSize
+        self.SatLvCons, self.ValCons, self.SatLvAsset, self.ValAsset = 0, 0, 0, 0
+        self.ActionChanged = True
+
+    def consume(self):       # choose how much to consume and save
+        current_cons = self.cons
+        Tremble = uniform() < self.TrblProbAction
+        Inertia = uniform() < self.inertia
+        Satisficing_Cons = self.ValCons >= self.SatLvCons
+        Satisficing_Asset = self.ValAsset >= self.SatLvAsset
+        if not(Inertia):
+            if not(Tremble):
+                if (not(Satisficing_Cons) and Satisficing_Asset):
+                    self.cons = randint(self.cons, min(self.asset, self.cons + self.StepSize))
+                elif (Satisficing_Cons and not(Satisficing_Asset)):
+                    self.cons = randint(max(0, self.cons - self.StepSize), self.cons)
+                elif (not(Satisficing_Cons) and not(Satisficing_Asset)):
+                    self.cons = randint(max(0, self.cons - self.StepSize), min(self.asset, self.cons + self.StepSize))
+            else:
+                self.cons = randint(max(0, self.cons - self.StepSize), min(self.asset, self.cons + self.StepSize))
+
+        self.cons = min(self.cons, self.asset//self.price)
+
+        if current_cons == self.cons:
+            self.ActionChanged = False
+
+        self.saving = self.asset - self.cons
+
+        Tremble = uniform() < self.TrblProbSatLv
+        lamda = uniform()**self.gamma
+        if not(Tremble):
+            self.SatLvCons += lamda*self.Lambda*min(self.ValCons - self.SatLvCons,0)
+            self.SatLvAsset += lamda*self.Lambda*min(self.ValAsset - self.SatLvAsset,0)
+        else:
+            self.SatLvCons += lamda*(self.ValCons - self.SatLvCons)
+            self.SatLvAsset += lamda*(self.ValAsset - self.SatLvAsset)
+
+    def evaluate(self):     # evaluate current saving and consumption decision in terms of current consumption level and next period asset
+
+        if self.asset <= 0:
+            print('negative asset', self.asset)
+            self.asset = 10
+
+        rho = uniform()**self.gamma
+        if not(self.ActionChanged):
+            self.ValCons += rho*(self.cons - self.ValCons)
+            self.ValAsset += rho*(self.asset - self.ValAsset)
+        else:
+            self.ValCons = self.cons
+            self.ValAsset = self.asset
+
+
+class Firm:
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5, price=10, StepSize=10, techs=[0.1, 0.1]):
+        self.TrblProbAction,self.TrblProbSatLv,self.Lambda, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.captial, self.price, self.interest, self.profit, self.StepSize, self.techs = 0, price, 0, 0, StepSize, techs
+        self.SatLv, self.Val = 0, 0
+        self.ActionChanged = True
+
+    def set_price(self,household,bank):     # set price and announce it to the public
+        current_price = self.price
+        Tremble = uniform() < self.TrblProbAction
+        Inertia = uniform() < self.inertia
+        Satisficing = self.Val >= self.SatLv
+        if not(Inertia):
+            if not(Tremble):
+                if not(Satisficing):
+                    self.price = randint(max(1, self.price - self.StepSize), self.price + self.StepSize)
+            else:
+                self.price = randint(max(1, self.price - self.StepSize), self.price + self.StepSize)
+
+        if current_price == self.price:
+            self.ActionChanged = False
+
+        household.price, bank.price = self.price, self.price
+
+        Tremble = uniform() < self.TrblProbSatLv
+        lamda = uniform()**self.gamma
+        if not(Tremble):
+            self.SatLv += lamda*self.Lambda*min(self.Val-self.SatLv,0)
+        else:
+            self.SatLv += lamda*(self.Val - self.SatLv)
+
+    def produce_evaluate(self,household):       # produce to meet demand, calculate profit and evaluate current pricing decision
+        tech = choice(self.techs)
+        self.profit = self.price*household.cons - (self.interest/1000.0)*self.captial - tech*self.price*(household.cons**2)/((self.captial**(0.1))*1.0)
+
+        rho = uniform()**self.gamma
+        if not(self.ActionChanged):
+            self.Val += rho*(self.profit - self.Val)
+        else:
+            self.Val = self.profit
+
+
+def run_simple_macro(Time=90000, seed=None):
+    random.seed(seed)
+    np.random.seed(seed)
+    b = Bank()
+    h = Household()
+    f = Firm()
+
+    p=[]
+    i=[]
+    c=[]
+    a=[] # in the real term
+    pi=[]
+
+    for t in range(Time):
+        b.set_interest(h,f,t)
+        f.set_price(h,b)
+        h.consume()
+        b.channel(h,f)
+        f.produce_evaluate(h)
+        b.transfer_evaluate(h,f)
+        h.evaluate()
+
+        p.append(f.price)
+        i.append(b.interest)
+        c.append(h.cons)
+        a.append(h.asset//f.price)
+        if t > 1:
+            pi.append(log(p[t])-log(p[t-1]))
+    return {'price': p, 'interest': i, 'consumption': c, 'asset': a, 'inflation': pi}
+
+
+# SimpleMacro3.py
+
+class Bank3:
+
+    def __init__(self,TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.9, interest=0.05, periods=2, delta=0.005, min_irate=0.001):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.periods, self.delta, self.min_irate = periods, delta, min_irate
+        self.lqdty, self.irate = 0, interest
+        self.p, self.f, self.i, self.r, self.c, self.a = [], [], [], [], [], []
+        self.inflation = 0
+        self.price = 1
+        self.sl_output, self.sl_infltn, self.val_output, self.val_infltn = 0, 0, 0, 0
+        self.ActionChanged = True
+
+    def set_interest(self, household, firm):
+        current_irate = self.irate
+        Tremble = uniform() < self.TrblActn
+        Inertia = uniform() < self.inertia
+        satisficing_output = self.val_output >= self.sl_output
+        satisficing_infltn = self.val_infltn >= self.sl_infltn
+        if not(Inertia):
+            if Tremble or not(satisficing_output) or not(satisficing_infltn):
+                    self.irate = uniform_range(max(self.min_irate, self.irate-(self.delta)), self.irate+(self.delta))
+            else:
+                self.irate = uniform_range(max(self.min_irate, self.irate-(self.delta)), self.irate+(self.delta))
+        if current_irate == self.irate:
+            self.ActionChanged = False
+        Tremble = uniform() < self.TrbSatLv
+        lamda = uniform()**self.gamma
+        if not(Tremble):
+            self.sl_output += lamda*self.LAMBDA*min(self.val_output - self.sl_output, 0)
+            self.sl_infltn += lamda*self.LAMBDA*min(self.val_infltn - self.sl_infltn, 0)
+        else:
+            self.sl_output += lamda*(self.val_output-self.sl_output)
+            self.sl_infltn += lamda*(self.val_infltn-self.sl_infltn)
+        household.irate = firm.irate = self.irate
+
+    def channel(self, household, firm):
+        # borrow money from household and lend it to firm
+        self.lqdty = min(household.saving, firm.capital_demand)
+        household.asset += max(0, household.saving - self.lqdty)
+        firm.capital = self.lqdty
+
+    def transfer_evaluate(self, household, firm):
+        # pay return from deposit and profit from firm to household
+        household.asset = 0.3 + household.asset*(1.01) + (1 + self.irate)*self.lqdty + firm.profit
+        output = household.consumption/(self.price*1.0)
+        if len(self.p) >= self.periods:
+            infltn = -(self.price - mean(self.p[-self.periods:]))**2
+        else:
+            infltn = 0
+        self.p.append(self.price)
+        if len(self.p) <= 2:
+            self.inflation = 0
+        else:
+            self.inflation = (self.p[-1]-self.p[-2])/self.p[-2]
+        self.f.append(firm.profit)
+        self.i.append(self.irate*100)
+        self.r.append(self.lqdty)
+        self.c.append(output)
+        self.a.append(household.asset)
+        # evaluate current economy in terms of consumption level and price volatility
+        rho = uniform()**self.gamma
+        if not(self.ActionChanged):
+            self.val_output += rho*(output - self.val_output)
+            self.val_infltn += rho*(infltn - self.val_infltn)
+        else:
+            self.val_output, self.val_infltn = output, infltn
+
+
+class Household3:
+
+    def __init__(self, bank, firm, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.5, asset=5, delta=0.1, irate_unit=0.005, irate_max=0.1):
+        self.TrblActn, self.TrbSatLv, self.LAMBDA, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.delta = delta
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.irate_nodes = range(int(irate_max/irate_unit))
+        self.asset = asset
+        self.price = self.saving = self.irate = 1
+        self.consumption = 1
+        self.c = [0.3 for n in self.irate_nodes]
+        self.sl_c = self.val_c = self.sl_asset = self.val_asset = \
+            [0 for n in self.irate_nodes]
+        self.ActionChanged = True
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)
+
+    def consume(self):       # choose how much to consume and save
+        irate_node = self.irate_node(self.irate)
+        self.consumption = self.c[irate_node]
+        Tremble = uniform() < self.TrblActn
+        Inertia = uniform() < self.inertia
+        satisficing_consuption = self.val_c[irate_node] >= self.sl_c[irate_node]
+        satisficing_asset = self.val_asset[irate_node] >= self.sl_asset[irate_node]
+        if not(Inertia):
+            if not(Tremble):
+                if (not(satisficing_consuption) and (satisficing_asset)):
+                    self.c[irate_node] = uniform_range(self.c[irate_node], min(1, self.c[irate_node]*(1+self.delta)))
+                elif (satisficing_consuption and not(satisficing_asset)):
+                    self.c[irate_node] = uniform_range(max(0, self.c[irate_node]*(1-self.delta)), self.c[irate_node])
+                elif (not(satisficing_consuption) and not(satisficing_asset)):
+                    self.c[irate_node] = uniform_range(max(0, self.c[irate_node]*(1-self.delta)), min(1, self.c[irate_node]*(1+self.delta)))
+            else:
+                self.c[irate_node] = uniform_range(max(0, self.c[irate_node]*(1-self.delta)), min(1, self.c[irate_node]*(1+self.delta)))
+        if self.consumption == self.c[irate_node]:
+            self.ActionChanged = False
+        self.consumption = self.asset*self.c[irate_node]
+        self.saving = self.asset - self.consumption
+        self.asset = 0
+        Tremble = uniform() < self.TrbSatLv
+        lamda = uniform()**self.gamma
+        if not(Tremble):
+            self.sl_c[irate_node] += lamda*self.LAMBDA*min(self.val_c[irate_node] - self.sl_c[irate_node],0)
+            self.sl_asset[irate_node] += lamda*self.LAMBDA*min(self.val_asset[irate_node] - self.sl_asset[irate_node],0)
+        else:
+            self.sl_c[irate_node] += lamda*(self.val_c[irate_node] - self.sl_c[irate_node])
+            self.sl_asset[irate_node] += lamda*(self.val_asset[irate_node] - self.sl_asset[irate_node])
+
+
+class Firm3:
+
+    def __init__(self, bank, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5, capital_power=0.4,
+                inertia=0.9, delta=0.05, techs=[1, 1], irate_unit=0.005, irate_max=0.1, depreciate=0.05):
+        self.TrblActn,self.TrbSatLv,self.LAMBDA, self.gamma, self.inertia = \
+            TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.capital, self.irate, self.profit, self.delta, self.techs = \
+            100, 0, 0, delta, techs
+        self.tech = choice(techs)
+        self.depreciate = depreciate
+        self.capital_power = capital_power
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.irate_nodes = range(int(irate_max/irate_unit))
+        self.capital_demand = 0
+        self.SatLv, self.Val = 0, 0
+        self.markup = [uniform() for n in self.irate_nodes]
+        self.price = [uniform_range(0.9, 1.0) for n in self.irate_nodes]
+        self.k = 10
+        self.SatLv = self.Val = [0 for n in self.irate_nodes]
+        self.ActionChanged = True
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)
+
+    def borrow(self, bank):
+        self.capital_demand = (self.irate/(self.capital_power*bank.price*self.tech))**(1/(self.capital_power-1))
+
+    def set_price(self, bank, household):     # set price and announce it to the public
+        irate_node = self.irate_node(self.irate)
+        self.current_price = self.price[irate_node]
+        Tremble = uniform() < self.TrblActn
+        Inertia = uniform() < self.inertia
+        Satisficing = self.Val[irate_node] >= self.SatLv[irate_node]
+        if not(Inertia):
+            if Tremble or not(Satisficing):
+                    self.price[irate_node] = uniform_range(self.price[irate_node]*(1-self.delta), self.price[irate_node]*(1+self.delta))
+        if self.current_price != self.price[irate_node]:
+            self.ActionChanged = True
+        household.price = bank.price = max(0.01, self.price[irate_node])
+        Tremble = uniform() < self.TrbSatLv
+        lamda = uniform()**self.gamma
+        if not(Tremble):
+            self.SatLv[irate_node] += lamda*self.LAMBDA*min(self.Val[irate_node] - self.SatLv[irate_node], 0)
+        else:
+            self.SatLv[irate_node] += lamda*(self.Val[irate_node] - self.SatLv[irate_node])
+
+    def produce_evaluate(self, bank, household):       # produce to meet demand, calculate profit and evaluate current pricing decision
+        irate_node = self.irate_node(self.irate)
+        self.tech = choice(self.techs)
+        capacity = bank.price*self.tech*(self.irate/(self.capital_power*bank.price*self.tech))**(self.capital_power/(self.capital_power-1))
+        if household.consumption > capacity:
+            household.asset += household.consumption - capacity
+            household.consumption =  capacity
+        self.profit = household.consumption - (self.irate + self.depreciate)*self.capital
+        rho = uniform()**self.gamma
+        if self.ActionChanged:
+            self.Val[irate_node] = self.profit
+        else:
+            self.Val[irate_node] += rho*(self.profit - self.Val[irate_node])
+
+
+def run_simple_macro3(Time=10000, seed=None):
+    random.seed(seed)
+    np.random.seed(seed)
+    b = Bank3(TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01)
+    f = Firm3(b, TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01)
+    h = Household3(b,f, TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01)
+
+    for t in range(Time):
+        b.set_interest(h, f)
+        if t < 5000:
+            b.irate = h.irate = f.irate = 0.05
+        else:
+            b.irate = h.irate = f.irate = 0.08
+        f.borrow(b)
+        f.set_price(b, h)
+        h.consume()
+        b.channel(h, f)
+        f.produce_evaluate(b, h)
+        b.transfer_evaluate(h, f)
+    return {'price': b.p, 'profit': b.f, 'capital': b.r, 'consumption': b.c, 'interest': b.i, 'asset': b.a}
@@ -0,0 +1,99 @@
+"""
+Random sources for the agents
+Uniforms are drawn from a NumPy Generator in large blocks and handed out one decision
+at a time, so agents pay a list lookup instead of a numpy.random call per draw. Every
+source is seeded through a SeedSequence: a run seeded with (seed, run index) reproduces
+bit for bit, in any process.
+"""
+import sys
+from math import log
+
+import numpy as np
+
+
+# uniforms drawn per refill of a RandomSource
+BLOCK = 4096
+
+
+def seed_sequence(seed=None):
+    # accept None, an int, a tuple of ints or an existing SeedSequence
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def spawn(seed, n):
+    # n independent child sequences, e.g. one per run of a batch
+    return seed_sequence(seed).spawn(n)
+
+
+def run_seed(seed, run):
+    # the child sequence of run number `run`, without spawning its predecessors
+    parent = seed_sequence(seed)
+    return np.random.SeedSequence(parent.entropy, spawn_key=parent.spawn_key + (run,))
+
+
+def generator(seed=None):
+    return np.random.default_rng(seed_sequence(seed))
+
+
+class RandomSource:
+    # one agent's stream of uniforms; block only changes how often the buffer refills,
+    # never the sequence of values handed out
+
+    def __init__(self, seed=None, block=BLOCK):
+        self.seed = seed_sequence(seed)
+        self.generator = np.random.default_rng(self.seed)
+        self.block = block
+        self.buffer = []
+
+    def refill(self):
+        # reversed, so that draws pop off the end of the list
+        self.buffer = self.generator.random(self.block)[::-1].tolist()
+
+    def random(self):
+        # a uniform on [0, 1), like numpy.random.uniform()
+        try:
+            return self.buffer.pop()
+        except IndexError:
+            self.refill()
+            return self.buffer.pop()
+
+    def uniform(self, lo, hi):
+        # like random.uniform(lo, hi)
+        return lo + (hi - lo)*self.random()
+
+    def randint(self, lo, hi):
+        # like random.randint(lo, hi), both ends included
+        lo, hi = int(lo), int(hi)
+        return lo + int(self.random()*(hi - lo + 1))
+
+    def choice(self, seq):
+        # like random.choice(seq), used for tech shocks
+        return seq[int(self.random()*len(seq))]
+
+    def run_length(self, p):
+        # how many events of probability p happen in a row before the first that does
+        # not, e.g. the inertial periods before an agent next decides; one draw
+        if p <= 0:
+            return 0
+        if p >= 1:
+            return sys.maxsize
+        return int(log(1.0 - self.random())/log(p))
+
+    def uniforms(self, n):
+        # a block of n uniforms for vectorized callers, taken from the same stream
+        start = max(0, len(self.buffer) - n)
+        rest = self.buffer[start:][::-1]
+        del self.buffer[start:]
+        drawn = self.generator.random(n - len(rest))
+        return np.concatenate([np.asarray(rest), drawn]) if rest else drawn
+
+    def spawn(self, n):
+        # n independent sources, e.g. one per agent
+        return [RandomSource(s, self.block) for s in self.seed.spawn(n)]
+
+
+def agent_sources(seed=None, agents=('bank', 'firm', 'household')):
+    # one independent source per agent of a run
+    return dict(zip(agents, RandomSource(seed).spawn(len(agents))))
@@ -0,0 +1,117 @@
+"""
+Global sensitivity analysis
+Morris elementary effects of behavioural parameters on moments of summary runs, by
+default the variances of output (consumption) and price. The design is r random
+one-at-a-time trajectories through a grid of `levels` levels over the parameter
+bounds; each trajectory moves every factor once, by half the grid, in random order.
+
+Design points are taken on the grid, so points shared between trajectories are
+simulated once, and all of them run as one sweep on a process pool over the same
+seeds (common random numbers). mu* (mean absolute effect) ranks how much a factor
+drives an output and sigma how non-linear or interacting it is; both come with
+bootstrap confidence intervals over trajectories.
+
+    analysis = morris(trajectories=20, T=5000, cache='sensitivity')
+    analysis['indices']['price.var']['firm.inertia']['mu_star']
+"""
+import tempfile
+from contextlib import nullcontext
+
+import numpy as np
+
+from .rng import generator
+from .sweep import ResultCache, sweep
+
+
+# the behavioural parameters analysed by default, with their bounds
+FACTORS = {
+    'bank.TrblActn': (0.0, 0.1),
+    'bank.inertia': (0.5, 0.99),
+    'bank.delta': (0.001, 0.01),
+    'bank.gamma': (0.1, 1.0),
+    'firm.TrblActn': (0.0, 0.1),
+    'firm.LAMBDA': (0.001, 0.1),
+    'firm.gamma': (0.1, 1.0),
+    'firm.inertia': (0.5, 0.99),
+    'firm.delta': (0.01, 0.2),
+    'household.TrblActn': (0.0, 0.1),
+    'household.inertia': (0.1, 0.9),
+    'household.delta': (0.01, 0.2),
+}
+
+OUTPUTS = ('consumption.var', 'price.var')
+
+
+def design(k, r, levels=4, rng=None):
+    # r Morris trajectories of k+1 grid points each, as level indices in
+    # 0..levels-1 of shape (r, k+1, k), with the factor moved at every step
+    rng = generator(rng)
+    jump = levels//2
+    points = np.empty((r, k + 1, k), dtype=int)
+    order = np.empty((r, k), dtype=int)
+    for t in range(r):
+        x = rng.integers(levels, size=k)
+        step = np.where(x < levels - jump, jump, -jump)
+        order[t] = rng.permutation(k)
+        points[t, 0] = x
+        for s, factor in enumerate(order[t]):
+            x = x.copy()
+            x[factor] += step[factor]
+            points[t, s + 1] = x
+    return points, order
+
+
+def bootstrap(effects, draws, rng):
+    # 95% intervals of mu* and sigma from resampling trajectories
+    r = len(effects)
+    samples = effects[rng.integers(r, size=(draws, r))]
+    mu_star = np.abs(samples).mean(axis=1)
+    sigma = samples.std(axis=1, ddof=1) if r > 1 else np.zeros(draws)
+    return tuple(np.percentile(mu_star, [2.5, 97.5]).tolist()), tuple(np.percentile(sigma, [2.5, 97.5]).tolist())
+
+
+def morris(factors=FACTORS, outputs=OUTPUTS, trajectories=10, levels=4, model='simple_macro3',
+           T=5000, replications=4, seed=0, fixed=None, cache=None, workers=None, draws=1000,
+           convergence=None):
+    # elementary effects of every factor on every output; each design point is
+    # averaged over the same `replications` seeds; convergence, Convergence
+    # arguments, ends every run once it converged (see sweep)
+    names = sorted(factors)
+    k = len(names)
+    bounds = np.array([factors[name] for name in names], dtype=float)
+    points, order = design(k, trajectories, levels, (seed, 0))
+    unique, inverse = np.unique(points.reshape(-1, k), axis=0, return_inverse=True)
+    cells = []
+    for level in unique:
+        params = dict(fixed or {})
+        values = bounds[:, 0] + (bounds[:, 1] - bounds[:, 0])*level/float(levels - 1)
+        params.update((name, float(value)) for name, value in zip(names, values))
+        cells.append(params)
+    seeds = [(seed, run + 1) for run in range(replications)]
+    y = np.empty((len(unique), len(outputs)))
+    # without a cache, the runs are kept on disk only while they are read back
+    with tempfile.TemporaryDirectory(prefix='sensitivity') if cache is None else nullcontext(cache) as cache:
+        records = sweep(model, cells, seeds, T, cache, workers=workers, summary=True, convergence=convergence)
+        store = ResultCache(cache)
+        for p in range(len(unique)):
+            runs = [store.load(record['key']) for record in records[p*replications:(p + 1)*replications]]
+            y[p] = [np.mean([run[output] for run in runs]) for output in outputs]
+    y = y[inverse.ravel()].reshape(trajectories, k + 1, len(outputs))
+    # effect of the factor moved at each step, per unit of its normalized range
+    delta = (levels//2)/float(levels - 1)
+    moved = np.diff(points, axis=1).sum(axis=2)
+    effects = np.empty((trajectories, k, len(outputs)))
+    for t in range(trajectories):
+        effects[t, order[t]] = np.diff(y[t], axis=0)/(np.sign(moved[t])*delta)[:, None]
+    rng = generator((seed, 0, 1))
+    indices = {}
+    for j, output in enumerate(outputs):
+        indices[output] = {}
+        for i, name in enumerate(names):
+            e = effects[:, i, j]
+            mu_star_ci, sigma_ci = bootstrap(e, draws, rng)
+            indices[output][name] = {'mu_star': float(np.abs(e).mean()), 'mu': float(e.mean()),
+                                     'sigma': float(e.std(ddof=1)) if len(e) > 1 else 0.0,
+                                     'mu_star_ci': mu_star_ci, 'sigma_ci': sigma_ci}
+    return {'indices': indices, 'points': len(unique), 'runs': len(unique)*replications,
+            'design_points': points.shape[0]*points.shape[1]}
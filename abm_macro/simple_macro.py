@@ -0,0 +1,246 @@
+"""
+Simple Macroeconomic Model with Satisficing Behaviour
+Model of SimpleMacro.py: interest rates in tenths of a percent set by a Taylor-style
+rule, integer price and consumption steps. The agents are variants of the satisficing
+agent of abm_macro.kernel.
+Authors: Hyun Chang Yi and Sarunas Girdenas
+"""
+from math import log
+
+import numpy as np
+
+from .kernel import DIRECTIONAL, JOINT, Integer, Satisficer, Target, by_events
+from .params import merge
+from .recorder import Recorder, RollingWindow
+from .rng import RandomSource, agent_sources
+from .stats import SummaryRecorder
+from .storage import CHUNK, ChunkWriter
+
+
+# bump whenever a change alters simulated paths, to invalidate cached results
+VERSION = 1
+
+# parameters of the economy simulated by SimpleMacro.py
+DEFAULT_PARAMS = {
+    'bank': dict(TrblProbAction=0.05, TrblProbSatLv=0.05, Lambda=0.05, gamma=0.5, inertia=0.5,
+                 interest=10, Periods=2, StepSize=10, initial_interest=10),
+    'household': dict(TrblProbAction=0.05, TrblProbSatLv=0.05, Lambda=0.05, gamma=0.5, inertia=0.5,
+                      asset=1000, cons=20, StepSize=10),
+    'firm': dict(TrblProbAction=0.05, TrblProbSatLv=0.05, Lambda=0.05, gamma=0.5, inertia=0.5,
+                 price=10, StepSize=10, techs=[0.1, 0.1]),
+    # 'period' draws the Bank's and Firm's inertia every period, as SimpleMacro.py
+    # does; 'event' draws the waiting time to their next decision instead
+    'schedule': 'period',
+}
+
+# series recorded by the main loop; asset is in real terms
+SERIES = ('price', 'interest', 'consumption', 'asset', 'inflation')
+DTYPES = {'price': np.int64}
+
+
+#In this model we have three types of agents: Households, Firms and Central Bank
+
+# names of the kernel parameters in this model
+ALIASES = {'TrblProbAction': 'tremble', 'TrblProbSatLv': 'retremble', 'Lambda': 'speed'}
+
+
+#Here we define Market for a Firm and a Household
+class Bank(Satisficer):
+
+    NAME, ALIASES, SEARCH = 'bank', ALIASES, JOINT
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5,interest=10,Periods=2,StepSize=10,initial_interest=10,rng=None,events=False):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.Wfr, self.Stbl, self.liquidity, self.interest, self.recent_prices, self.StepSize = 0, 0, 0, interest, RollingWindow(Periods, fill=1), StepSize
+        self.inflation = log(self.recent_prices[-1])-log(self.recent_prices[-2])
+        self.SatLvWfr, self.SatLvStbl, self.ValWfr, self.ValStbl = 0, 0, 0, 0
+        self.ActionChanged = True
+        self.initial_interest = initial_interest
+        self.move = Target()
+        self.rng = rng or RandomSource()
+        self.schedule(events)
+        
+    def set_interest(self,household,firm,t,alpha_i=0.5,alpha_infl=0.5): 
+        # Set nominal interest rate as 0,1,2,...,i,i+1,... where  i stands for 0.1*i percent and announce to the public
+        self.inflation = log(self.recent_prices[-1])-log(self.recent_prices[-2])
+        CurrentRate = self.interest
+        self.alpha_i, self.alpha_infl = alpha_i, alpha_infl # Policy maker preferences in Taylor rules
+        # a searching Bank moves to its rule instead of a random rate
+        # Rule for random choice randint(max(0, self.interest - self.StepSize), self.interest + self.StepSize)
+        if t == 0:
+            self.move.target = self.initial_interest
+        else:
+            self.move.target = max(0,alpha_i*household.cons+alpha_infl*(self.inflation))
+        self.interest, (self.SatLvWfr, self.SatLvStbl) = self.decide(
+            self.interest, (self.SatLvWfr, self.SatLvStbl), (self.ValWfr, self.ValStbl), self.move)
+
+        if CurrentRate == self.interest:
+            self.ActionChanged = False
+
+        household.interest, firm.interest = self.interest, self.interest
+
+    def channel(self,household,firm): # borrow money from household and lend it to firm
+        self.liquidity = household.saving
+        firm.captial = self.liquidity
+
+    def transfer_evaluate(self,household,firm): 
+        # pay return from deposit and profit from firm to household
+        household.asset = (1 + self.interest/1000.0)*self.liquidity + firm.profit
+
+        # evaluate current economy in terms of consumption level and price volatility
+        self.Wfr = household.cons
+        self.Stbl = -(firm.price - self.recent_prices.mean())**2
+        self.recent_prices.push(firm.price)        
+
+        self.ValWfr, self.ValStbl = self.valuate(self.ActionChanged, (self.ValWfr, self.ValStbl), (self.Wfr, self.Stbl))
+
+
+class Household(Satisficer):
+
+    # consumption is raised when it falls short and cut when asset does
+    NAME, ALIASES, SEARCH = 'household', ALIASES, DIRECTIONAL
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5,asset=1000, cons=20, StepSize=10, rng=None):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.asset, self.price, self.cons, self.saving, self.interest, self.StepSize = asset, 0, cons, 0, 0, StepSize
+        self.move = Integer(StepSize, floor=0)
+        self.SatLvCons, self.ValCons, self.SatLvAsset, self.ValAsset = 0, 0, 0, 0
+        self.ActionChanged = True
+        self.rng = rng or RandomSource()
+
+    def consume(self):       # choose how much to consume and save
+        current_cons = self.cons
+        # never more than the asset
+        self.cons, (self.SatLvCons, self.SatLvAsset) = self.decide(
+            self.cons, (self.SatLvCons, self.SatLvAsset), (self.ValCons, self.ValAsset), self.move, ceiling=self.asset)
+
+        self.cons = min(self.cons, self.asset//self.price)
+
+        if current_cons == self.cons:
+            self.ActionChanged = False
+
+        self.saving = self.asset - self.cons
+
+    def evaluate(self):     # evaluate current saving and consumption decision in terms of current consumption level and next period asset
+
+        if self.asset <= 0:
+            print('negative asset', self.asset)
+            self.asset = 10
+
+        self.ValCons, self.ValAsset = self.valuate(self.ActionChanged, (self.ValCons, self.ValAsset), (self.cons, self.asset))
+
+class Firm(Satisficer):
+
+    NAME, ALIASES, SEARCH = 'firm', ALIASES, JOINT
+
+    def __init__(self,TrblProbAction=0.05,TrblProbSatLv=0.05,Lambda=0.05,gamma=0.5,inertia=0.5, price=10, StepSize=10, techs=[0.1, 0.1], rng=None, events=False):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = TrblProbAction,TrblProbSatLv,Lambda, gamma, inertia
+        self.captial, self.price, self.interest, self.profit, self.StepSize, self.techs = 0, price, 0, 0, StepSize, techs
+        self.move = Integer(StepSize, floor=1)
+        self.SatLv, self.Val = 0, 0
+        self.ActionChanged = True
+        self.rng = rng or RandomSource()
+        self.schedule(events)
+
+    def set_price(self,household,bank):     # set price and announce it to the public
+        current_price = self.price
+        self.price, (self.SatLv,) = self.decide(self.price, (self.SatLv,), (self.Val,), self.move)
+
+        if current_price == self.price:
+            self.ActionChanged = False
+
+        household.price, bank.price = self.price, self.price
+
+    def produce_evaluate(self,household):       # produce to meet demand, calculate profit and evaluate current pricing decision
+        tech = self.rng.choice(self.techs)
+        self.profit = self.price*household.cons - (self.interest/1000.0)*self.captial - tech*self.price*(household.cons**2)/((self.captial**(0.1))*1.0)
+        
+        self.Val, = self.valuate(self.ActionChanged, (self.Val,), (self.profit,))
+
+
+class Economy:
+    # one Bank, Household and Firm stepped through the loop of SimpleMacro.py
+
+    def __init__(self, params=None, seed=None, horizon=None, series=SERIES, recorder=None):
+        # horizon, when known, preallocates the recorded series; a recorder such as a
+        # ChunkWriter replaces the in-memory one
+        self.params = merge(DEFAULT_PARAMS, params)
+        self.seed = seed
+        rng = agent_sources(seed)
+        events = by_events(self.params['schedule'])
+        self.bank = Bank(rng=rng['bank'], events=events, **self.params['bank'])
+        self.household = Household(rng=rng['household'], **self.params['household'])
+        self.firm = Firm(rng=rng['firm'], events=events, **self.params['firm'])
+        self.recorder = Recorder(horizon, series, DTYPES) if recorder is None else recorder
+        self.last_price = None
+        self.t = 0
+
+    def step(self):
+        b, h, f, t = self.bank, self.household, self.firm, self.t
+        b.set_interest(h,f,t)
+        f.set_price(h,b)
+        h.consume()
+        b.channel(h,f)
+        f.produce_evaluate(h)
+        b.transfer_evaluate(h,f)
+        h.evaluate()
+
+        # inflation is first recorded in period 2
+        if t > 1:
+            inflation = log(f.price)-log(self.last_price)
+        else:
+            inflation = np.nan
+        self.recorder.record(price=f.price, interest=b.interest, consumption=h.cons,
+                             asset=h.asset//f.price, inflation=inflation)
+        self.last_price = f.price
+        self.t += 1
+
+    def run(self, T, stop=None):
+        # step T more periods, or fewer if the monitor `stop` (see convergence) ends
+        # the run, and return everything recorded so far
+        for t in range(T):
+            self.step()
+            if stop is not None and stop.update(self):
+                break
+        return self.results()
+
+    def indicators(self):
+        # aspiration and valuation levels of every agent and the latest recorded
+        # values, for convergence monitors
+        b, h, f = self.bank, self.household, self.firm
+        values = {'bank.SatLvWfr': b.SatLvWfr, 'bank.ValWfr': b.ValWfr,
+                  'bank.SatLvStbl': b.SatLvStbl, 'bank.ValStbl': b.ValStbl,
+                  'household.SatLvCons': h.SatLvCons, 'household.ValCons': h.ValCons,
+                  'household.SatLvAsset': h.SatLvAsset, 'household.ValAsset': h.ValAsset,
+                  'firm.SatLv': f.SatLv, 'firm.Val': f.Val}
+        values.update(self.recorder.latest)
+        return values
+
+    def results(self):
+        return self.recorder.results()
+
+    def reseed(self, seed):
+        # continue on fresh random streams, e.g. in one branch of a fork
+        self.seed = seed
+        rng = agent_sources(seed)
+        self.bank.rng, self.household.rng, self.firm.rng = rng['bank'], rng['household'], rng['firm']
+
+
+def run(T=90000, params=None, seed=None, series=SERIES, path=None, chunk=CHUNK, stop=None,
+        summary=False, lags=(1,), switch=None):
+    # simulate T periods, or until the monitor `stop` ends the run, and return the
+    # chosen series as arrays; with a path they are streamed to disk in chunks and
+    # returned memory-mapped; with summary=True nothing per period is kept and the
+    # streaming statistics of SummaryRecorder are returned instead
+    if summary:
+        # statistics only; before and after refer to period `switch`, if given
+        recorder = SummaryRecorder(series, lags, switch)
+    elif path is not None:
+        recorder = ChunkWriter(path, series, DTYPES, chunk)
+    else:
+        recorder = None
+    economy = Economy(params, seed, T, series, recorder)
+    results = economy.run(T, stop)
+    if isinstance(recorder, ChunkWriter):
+        recorder.close()
+    return results
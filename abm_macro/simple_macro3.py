@@ -0,0 +1,361 @@
+"""
+Simple Macroeconomic Model with Satisficing Behaviour
+Model of SimpleMacro3.py: decimal interest rates, consumption and price tables over
+interest rate nodes, and the Bank's rate overridden by a policy path. The agents are
+variants of the satisficing agent of abm_macro.kernel.
+Authors: Hyun Chang Yi and Sarunas Girdenas
+"""
+from .kernel import ALWAYS, DIRECTIONAL, JOINT, Additive, Proportional, Satisficer, by_events
+from .nodes import NodeTable
+from .params import merge
+from .policies import StepPolicy
+from .recorder import Recorder, RollingWindow
+from .rng import RandomSource, agent_sources
+from .stats import SummaryRecorder
+from .storage import CHUNK, ChunkWriter
+
+
+# bump whenever a change alters simulated paths, to invalidate cached results
+VERSION = 2
+
+# parameters of the economy simulated by SimpleMacro3.py
+DEFAULT_PARAMS = {
+    'bank': dict(TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01, gamma=0.5, inertia=0.9,
+                 interest=0.05, periods=2, delta=0.005, min_irate=0.001),
+    'firm': dict(TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01, gamma=0.5, capital_power=0.4,
+                 inertia=0.9, delta=0.05, techs=[1, 1], irate_unit=0.005, irate_max=0.1,
+                 depreciate=0.05),
+    'household': dict(TrblActn=0.01, TrbSatLv=0.01, LAMBDA=0.01, gamma=0.5, inertia=0.5,
+                      asset=5, delta=0.1, irate_unit=0.005, irate_max=0.1),
+    # the rate is fixed at `before` until period `switch` and at `after` from then on
+    'policy': dict(switch=5000, before=0.05, after=0.08),
+    # 'period' draws the Bank's and Firm's inertia every period, as SimpleMacro3.py
+    # does; 'event' draws the waiting time to their next decision instead
+    'schedule': 'period',
+}
+
+# series recorded by the Bank; capital is the liquidity channelled to the firm
+SERIES = ('price', 'profit', 'capital', 'consumption', 'interest', 'asset', 'inflation')
+
+
+#In this model we have three types of agents: Households, Firms and Central Bank
+
+# names of the kernel parameters in this model
+ALIASES = {'TrblActn': 'tremble', 'TrbSatLv': 'retremble', 'LAMBDA': 'speed'}
+
+# Bank sets nominal interest rate, operate capital market, clear payments and records economy
+class Bank(Satisficer):
+
+    # a Bank that is not inertial walks its rate whether it trembles, satisfices or not
+    NAME, ALIASES, SEARCH = 'bank', ALIASES, ALWAYS
+
+    @staticmethod
+    def step_rule(delta=0.005, min_irate=0.001, **params):
+        return Additive(delta, floor=min_irate)
+
+    def __init__(self,TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.9, interest=0.05, periods=2, delta=0.005, min_irate=0.001, rng=None, recorder=None,
+                events=False):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.periods, self.delta, self.min_irate = periods, delta, min_irate
+        self.move = self.step_rule(delta, min_irate)
+        self.rng = rng or RandomSource()
+        # self.irate_nodes = range(int(max_irate/unit) + 1)   # decision nodes over interest rates
+        self.lqdty, self.irate = 0, interest
+        # recent prices for the inflation-stability objective, and the recorded series
+        self.window, self.last_price = RollingWindow(periods), 1
+        self.recorder = Recorder(series=SERIES) if recorder is None else recorder
+        # self.alp_i, self.alp_p = 1, 1
+        self.inflation = 0
+        self.price = 1
+        self.sl_output, self.sl_infltn, self.val_output, self.val_infltn = 0, 0, 0, 0
+        self.ActionChanged = True
+        self.schedule(events)
+        
+    def set_interest(self, household, firm):
+        # Set nominal interest rate as 0,1,2,...,i,i+1,... where  i stands for 0.1*i percent and announce to the public
+        #current_coefs = [self.alp_i, self.alp_p]
+        current_irate = self.irate
+        self.irate, (self.sl_output, self.sl_infltn) = self.decide(
+            self.irate, (self.sl_output, self.sl_infltn), (self.val_output, self.val_infltn), self.move)
+        # self.irate = min(self.irate, int(self.max_irate/self.unit))
+        if current_irate == self.irate:
+            self.ActionChanged = False
+        # if not(Inertia):
+        #     if (Tremble or not(satisficing_output) or not(satisficing_infltn)):
+        #         self.alp_i = randint(max(-2, self.alp_i - self.delta), min(5, self.alp_i + self.delta))
+        #         self.alp_p = randint(max(-2, self.alp_p - self.delta), min(5, self.alp_p + self.delta))
+        # # Rule for random choice randint(max(0, self.irate - self.delta), self.irate + self.delta)
+        # self.irate = int(min(max(0, self.alp_i*household.c[irate_node] 
+        #     + self.alp_p*self.inflation), self.max_irate/self.unit))
+        # if current_coefs == [self.alp_i, self.alp_p] :
+        #     self.ActionChanged = False
+        household.irate = firm.irate = self.irate
+
+    def channel(self, household, firm):
+        # borrow money from household and lend it to firm
+        self.lqdty = min(household.saving, firm.capital_demand)
+        household.asset += max(0, household.saving - self.lqdty)
+        firm.capital = self.lqdty
+        # firm.capital = self.lqdty = household.saving
+
+    def transfer_evaluate(self, household, firm): 
+        # pay return from deposit and profit from firm to household
+        # print '3. before transfer', household.asset, (1 + self.irate*self.unit)*self.lqdty, firm.profit
+        household.asset = 0.3 + household.asset*(1.01) + (1 + self.irate)*self.lqdty + firm.profit
+        # print '3. after transfer :', self.price, household.asset
+        output = household.consumption/(self.price*1.0)
+        self.evaluate(output, firm.profit, household.asset)
+
+    def evaluate(self, output, profit, asset):
+        # record the period and evaluate the economy in terms of output and price stability
+        #infltn = -self.inflation
+        if self.window.full():
+            infltn = -(self.price - self.window.mean())**2
+        else:
+            infltn = 0
+        #household.asset = int((1 + self.irate*self.unit)*self.lqdty + firm.profit)
+        self.window.push(self.price)
+        if self.window.count <= 2:
+            self.inflation = 0
+        else:
+            self.inflation = (self.price-self.last_price)/self.last_price
+        self.last_price = self.price
+        self.recorder.record(price=self.price, profit=profit, capital=self.lqdty,
+                             consumption=output, interest=self.irate*100, asset=asset,
+                             inflation=self.inflation)
+        # evaluate current economy in terms of consumption level and price volatility
+        self.val_output, self.val_infltn = self.valuate(self.ActionChanged, (self.val_output, self.val_infltn), (output, infltn))
+
+        
+class Household(Satisficer):
+
+    # consumption is raised when it falls short and cut when asset does
+    NAME, ALIASES, SEARCH = 'household', ALIASES, DIRECTIONAL
+
+    @staticmethod
+    def step_rule(delta=0.1, **params):
+        # a share of the asset between 0 and 1
+        return Proportional(delta, floor=0, ceiling=1)
+
+    def __init__(self, bank, firm, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5,
+                inertia=0.5, asset=5, delta=0.1, irate_unit=0.005, irate_max=0.1, rng=None):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.delta = delta
+        self.move = self.step_rule(delta)
+        self.rng = rng or RandomSource()
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.irate_nodes = range(int(irate_max/irate_unit))
+        self.asset = asset
+        self.price = self.saving = self.irate = 1
+        self.consumption = 1
+        # tables over the visited interest rate nodes, indexed by slot
+        self.nodes = NodeTable({'c': 0.3, 'sl_c': 0, 'val_c': 0, 'sl_asset': 0, 'val_asset': 0})
+        self.c, self.sl_c, self.val_c, self.sl_asset, self.val_asset = \
+            [self.nodes[name] for name in ('c', 'sl_c', 'val_c', 'sl_asset', 'val_asset')]
+        self.ActionChanged = True
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)
+
+    def consume(self):       # choose how much to consume and save
+        slot = self.nodes.slot(self.irate_node(self.irate))
+        # print '1. consumption:', self.asset
+        self.consumption = self.c[slot]
+        self.c[slot], (self.sl_c[slot], self.sl_asset[slot]) = self.decide(
+            self.c[slot], (self.sl_c[slot], self.sl_asset[slot]), (self.val_c[slot], self.val_asset[slot]), self.move)
+        if self.consumption == self.c[slot]:
+            self.ActionChanged = False        
+        # self.consumption = self.c[irate_node]
+        self.consumption = self.asset*self.c[slot]
+        self.saving = self.asset - self.consumption
+        self.asset = 0
+        # print '1. after consumption: saving and consumption', self.saving, self.consumption
+
+    def evaluate(self):     
+        # evaluate current saving and consumption decision in terms of current consumption level and next period asset
+        slot = self.nodes.slot(self.irate_node(self.irate))
+        if self.asset <= 0:
+            print('negative asset', self.asset)
+            self.asset = 10
+        self.val_c[slot], self.val_asset[slot] = self.valuate(self.ActionChanged, (self.val_c[slot], self.val_asset[slot]),
+                                                              (self.consumption/self.price, self.asset))
+
+
+class Firm(Satisficer):
+
+    NAME, ALIASES, SEARCH = 'firm', ALIASES, JOINT
+
+    @staticmethod
+    def step_rule(delta=0.05, **params):
+        return Proportional(delta)
+
+    def __init__(self, bank, TrblActn=0.05, TrbSatLv=0.05, LAMBDA=0.05, gamma=0.5, capital_power=0.4,
+                inertia=0.9, delta=0.05, techs=[1, 1], irate_unit=0.005, irate_max=0.1, depreciate=0.05, rng=None,
+                events=False):
+        self.tremble, self.retremble, self.speed, self.gamma, self.inertia = \
+            TrblActn, TrbSatLv, LAMBDA, gamma, inertia
+        self.capital, self.irate, self.profit, self.delta, self.techs = \
+            100, 0, 0, delta, techs
+        self.move = self.step_rule(delta)
+        self.rng = rng or RandomSource()
+        self.tech = self.rng.choice(techs)
+        self.depreciate = depreciate
+        self.capital_power = capital_power
+        self.irate_unit, self.irate_max = irate_unit, irate_max
+        self.irate_nodes = range(int(irate_max/irate_unit))
+        self.capital_demand = 0
+        # tables over the visited interest rate nodes, indexed by slot; a node's
+        # markup and price are drawn when it is first visited
+        self.nodes = NodeTable({'markup': self.draw_markup, 'price': self.draw_price, 'SatLv': 0, 'Val': 0})
+        self.markup, self.price, self.SatLv, self.Val = \
+            [self.nodes[name] for name in ('markup', 'price', 'SatLv', 'Val')]
+        self.k = 10
+        # self.k = [10 for n in self.irate_nodes]
+        self.ActionChanged = True
+        self.schedule(events)
+
+    def irate_node(self, irate):
+        irate = min(self.irate_max - self.irate_unit, irate)
+        return int(irate/self.irate_unit)        
+
+    def draw_markup(self):
+        return self.rng.random()
+
+    def draw_price(self):
+        return self.rng.uniform(0.9, 1.0)
+
+    def borrow(self, bank):     # set price and announce it to the public
+        # self.capital_demand = self.k
+        # Tremble = uniform() < self.TrblActn
+        # Inertia = uniform() < self.inertia
+        # Satisficing = self.Val[irate_node] >= self.SatLv[irate_node]
+        # if not(Inertia):
+        #     if Tremble or not(Satisficing):
+        #         self.k = uniform_range(max(10, self.k*(1-self.delta)), self.k*(1+self.delta))
+
+        # if self.capital_demand != self.k:
+        #     self.ActionChanged = True
+        # print 'borrow: ', self.capital_power*bank.price*self.tech
+        self.capital_demand = (self.irate/(self.capital_power*bank.price*self.tech))**(1/(self.capital_power-1))
+
+    def set_price(self, bank, household):     # set price and announce it to the public
+        slot = self.nodes.slot(self.irate_node(self.irate))
+        self.current_price = self.price[slot]
+        # print 'price range:', self.price[irate_node]*(1-self.delta), self.price[irate_node]*(1+self.delta)
+        self.price[slot], (self.SatLv[slot],) = self.decide(self.price[slot], (self.SatLv[slot],), (self.Val[slot],), self.move)
+        if self.current_price != self.price[slot]:
+        # if self.ActionChanged or self.current_price != self.price[irate_node]:            
+            self.ActionChanged = True        
+        # current_markup = self.markup[irate_node]
+        # Tremble = uniform() < self.TrblActn
+        # Inertia = uniform() < self.inertia
+        # Satisficing = self.Val[irate_node] >= self.SatLv[irate_node]
+        # if not(Inertia):
+        #     if Tremble or not(Satisficing):
+        #         self.markup[irate_node] = uniform_range(max(0, self.markup[irate_node]*(1-self.delta)), self.markup[irate_node]*(1+self.delta))
+        # if self.ActionChanged or current_markup != self.markup[irate_node]:
+        #     self.ActionChanged = True
+        # price = (1+self.markup[irate_node])*(self.irate*self.unit)*(self.capital**(1-self.capital_power))/(self.capital_power*self.tech)
+        household.price = bank.price = max(0.01, self.price[slot])
+
+    def produce_evaluate(self, bank, household):       # produce to meet demand, calculate profit and evaluate current pricing decision
+        slot = self.nodes.slot(self.irate_node(self.irate))        
+        self.tech = self.rng.choice(self.techs)
+        capacity = bank.price*self.tech*(self.irate/(self.capital_power*bank.price*self.tech))**(self.capital_power/(self.capital_power-1))
+        if household.consumption > capacity:
+            household.asset += household.consumption - capacity
+            household.consumption =  capacity
+        self.profit = household.consumption - (self.irate + self.depreciate)*self.capital
+        self.Val[slot], = self.valuate(self.ActionChanged, (self.Val[slot],), (self.profit,))
+        # print '2. produce: asset, capital, capacity, profit', household.asset, self.capital, capacity, self.profit
+
+
+def make_policy(spec):
+    # None leaves the rate chosen by the Bank in place
+    return None if spec is None else StepPolicy(**spec)
+
+
+class Economy:
+    # one Bank, Firm and Household stepped through the loop of SimpleMacro3.py
+
+    def __init__(self, params=None, seed=None, horizon=None, series=SERIES, recorder=None):
+        # horizon, when known, preallocates the recorded series; a recorder such as a
+        # ChunkWriter replaces the in-memory one
+        self.params = merge(DEFAULT_PARAMS, params)
+        self.seed = seed
+        rng = agent_sources(seed)
+        self.recorder = Recorder(horizon, series) if recorder is None else recorder
+        events = by_events(self.params['schedule'])
+        self.bank = Bank(rng=rng['bank'], recorder=self.recorder, events=events, **self.params['bank'])
+        self.firm = Firm(self.bank, rng=rng['firm'], events=events, **self.params['firm'])
+        self.household = Household(self.bank, self.firm, rng=rng['household'], **self.params['household'])
+        self.policy = make_policy(self.params['policy'])
+        self.t = 0
+
+    def step(self):
+        b, f, h = self.bank, self.firm, self.household
+        b.set_interest(h, f)
+        if self.policy is not None:
+            b.irate = h.irate = f.irate = self.policy(self.t)
+        f.borrow(b)
+        f.set_price(b, h)
+        h.consume()
+        b.channel(h, f)
+        f.produce_evaluate(b, h)
+        b.transfer_evaluate(h, f)
+        # h.evaluate()
+        self.t += 1
+
+    def run(self, T, stop=None):
+        # step T more periods, or fewer if the monitor `stop` (see convergence) ends
+        # the run, and return everything recorded so far
+        for t in range(T):
+            self.step()
+            if stop is not None and stop.update(self):
+                break
+        return self.results()
+
+    def indicators(self):
+        # aspiration and valuation levels at the current nodes, the actions taken there
+        # and the latest recorded values, for convergence monitors
+        b, f, h = self.bank, self.firm, self.household
+        hn, fn = h.nodes.slot(h.irate_node(h.irate)), f.nodes.slot(f.irate_node(f.irate))
+        values = {'bank.sl_output': b.sl_output, 'bank.val_output': b.val_output,
+                  'bank.sl_infltn': b.sl_infltn, 'bank.val_infltn': b.val_infltn,
+                  'household.c': h.c[hn], 'household.sl_c': h.sl_c[hn], 'household.val_c': h.val_c[hn],
+                  'household.sl_asset': h.sl_asset[hn], 'household.val_asset': h.val_asset[hn],
+                  'firm.price': f.price[fn], 'firm.SatLv': f.SatLv[fn], 'firm.Val': f.Val[fn]}
+        values.update(self.recorder.latest)
+        return values
+
+    def results(self):
+        return self.recorder.results()
+
+    def reseed(self, seed):
+        # continue on fresh random streams, e.g. in one branch of a fork
+        self.seed = seed
+        rng = agent_sources(seed)
+        self.bank.rng, self.firm.rng, self.household.rng = rng['bank'], rng['firm'], rng['household']
+
+
+def run(T=10000, params=None, seed=None, series=SERIES, path=None, chunk=CHUNK, stop=None,
+        summary=False, lags=(1,)):
+    # simulate T periods, or until the monitor `stop` ends the run, and return the
+    # chosen series as arrays; with a path they are streamed to disk in chunks and
+    # returned memory-mapped; with summary=True nothing per period is kept and the
+    # streaming statistics of SummaryRecorder are returned instead
+    if summary:
+        # statistics only; before and after refer to the policy switch, if any
+        policy = merge(DEFAULT_PARAMS, params)['policy']
+        recorder = SummaryRecorder(series, lags, None if policy is None else policy['switch'])
+    elif path is not None:
+        recorder = ChunkWriter(path, series, None, chunk)
+    else:
+        recorder = None
+    economy = Economy(params, seed, T, series, recorder)
+    results = economy.run(T, stop)
+    if isinstance(recorder, ChunkWriter):
+        recorder.close()
+    return results
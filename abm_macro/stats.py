@@ -0,0 +1,129 @@
+"""
+Online statistics
+Estimators updated one observation at a time in constant memory: RunningMoments for
+arrays of series, OnlineSeries and SummaryRecorder for runs summarised without
+keeping their paths.
+"""
+from math import isfinite, nan, sqrt
+
+import numpy as np
+
+
+class RunningMoments:
+    # Welford's mean and variance; x may be a scalar or an array of independent
+    # series updated together
+
+    def __init__(self, shape=()):
+        self.n = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta/self.n
+        self.m2 = self.m2 + delta*(x - self.mean)
+
+    @property
+    def var(self):
+        # sample variance
+        return self.m2/(self.n - 1) if self.n > 1 else np.zeros_like(self.m2)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+
+class OnlineSeries:
+    # streaming summary of one scalar series: Welford mean and variance, lag-k
+    # autocorrelations from running co-moments of (x[t-k], x[t]) pairs, and the
+    # means before and after period `switch`; non-finite values are skipped
+
+    def __init__(self, lags=(1,), switch=None):
+        self.lags, self.switch = tuple(lags), switch
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        # the last max(lags) values, most recent last
+        self.recent = []
+        # per lag: pairs, mean of x[t-k], mean of x[t], their m2s and co-moment
+        self.pairs = [[0, 0.0, 0.0, 0.0, 0.0, 0.0] for k in self.lags]
+        self.before, self.after = [0, 0.0], [0, 0.0]
+
+    def update(self, x, t):
+        if not isfinite(x):
+            return
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta/self.n
+        self.m2 += delta*(x - self.mean)
+        recent = self.recent
+        for k, pair in zip(self.lags, self.pairs):
+            if len(recent) >= k:
+                y = recent[-k]
+                pair[0] += 1
+                dy, dx = y - pair[1], x - pair[2]
+                pair[1] += dy/pair[0]
+                pair[2] += dx/pair[0]
+                pair[3] += dy*(y - pair[1])
+                pair[4] += dx*(x - pair[2])
+                pair[5] += dy*(x - pair[2])
+        recent.append(x)
+        if len(recent) > self.lags[-1]:
+            del recent[0]
+        if self.switch is not None:
+            regime = self.before if t < self.switch else self.after
+            regime[0] += 1
+            regime[1] += (x - regime[1])/regime[0]
+
+    def var(self):
+        return self.m2/(self.n - 1) if self.n > 1 else nan
+
+    def acf(self, lag):
+        pair = self.pairs[self.lags.index(lag)]
+        scale = sqrt(pair[3]*pair[4])
+        return pair[5]/scale if scale > 0 else nan
+
+    def summary(self, name):
+        stats = {name + '.count': self.n, name + '.mean': self.mean if self.n else nan,
+                 name + '.var': self.var()}
+        for k in self.lags:
+            stats['{}.acf{}'.format(name, k)] = self.acf(k)
+        if self.switch is not None:
+            stats[name + '.before'] = self.before[1] if self.before[0] else nan
+            stats[name + '.after'] = self.after[1] if self.after[0] else nan
+        return stats
+
+
+class SummaryRecorder:
+    # records like a Recorder but keeps only an OnlineSeries per series, so a run
+    # takes the same memory whatever its length
+
+    def __init__(self, series=(), lags=(1,), switch=None):
+        self.series, self.lags, self.switch = tuple(series), tuple(sorted(lags)), switch
+        self.summaries = [OnlineSeries(self.lags, switch) for name in self.series]
+        self.n, self.latest = 0, {}
+
+    def record(self, **values):
+        n = self.n
+        for name, summary in zip(self.series, self.summaries):
+            summary.update(values[name], n)
+        self.n = n + 1
+        self.latest = values
+
+    def move_switch(self, t):
+        # split before and after at period t from now on, e.g. once a regime is cut
+        # short; t must not lie before the periods already recorded
+        if t < self.n:
+            raise ValueError('period {} was recorded already'.format(t))
+        self.switch = t
+        for summary in self.summaries:
+            summary.switch = t
+
+    def __len__(self):
+        return self.n
+
+    def results(self):
+        # one scalar per statistic, keyed 'series.statistic', e.g. 'price.acf1'
+        results = {}
+        for name, summary in zip(self.series, self.summaries):
+            results.update(summary.summary(name))
+        return results
@@ -0,0 +1,113 @@
+"""
+Streaming output of simulated series
+A ChunkWriter records like a Recorder but keeps only one chunk of periods in memory.
+Each full chunk is appended to one raw binary file per series and made durable before
+meta.json, which holds the dtypes and the number of periods written, is replaced. A
+run that crashes leaves every flushed chunk readable, and load maps the columns
+without copying them.
+"""
+import json
+import os
+
+import numpy as np
+
+from .recorder import Recorder
+
+
+# periods held in memory between flushes
+CHUNK = 1 << 16
+
+META = 'meta.json'
+
+
+def column_path(path, name):
+    return os.path.join(path, name + '.bin')
+
+
+class ChunkWriter:
+
+    def __init__(self, path, series, dtypes=None, chunk=CHUNK, width=None):
+        self.path, self.length = path, 0
+        self.buffer = Recorder(chunk, series, dtypes, width)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.files = dict((name, open(column_path(path, name), 'wb')) for name in self.buffer.series)
+        self.write_meta()
+
+    @property
+    def series(self):
+        return self.buffer.series
+
+    @property
+    def latest(self):
+        return self.buffer.latest
+
+    def write_meta(self):
+        meta = {'length': self.length, 'width': self.buffer.width,
+                'series': dict((name, np.dtype(self.buffer.dtypes[name]).str) for name in self.series)}
+        tmp = os.path.join(self.path, META + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, META))
+
+    def record(self, **values):
+        self.buffer.record(**values)
+        if self.buffer.n == self.buffer.capacity:
+            self.flush()
+
+    def flush(self):
+        # append the buffered periods to disk and empty the buffer
+        n = self.buffer.n
+        if n == 0:
+            return
+        for name, column in self.buffer.columns.items():
+            f = self.files[name]
+            f.write(column[:n].tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.length += n
+        self.buffer.n = 0
+        self.write_meta()
+
+    def close(self):
+        if self.files:
+            self.flush()
+            for f in self.files.values():
+                f.close()
+            self.files = {}
+
+    def __len__(self):
+        return self.length + self.buffer.n
+
+    def __getstate__(self):
+        raise TypeError('a ChunkWriter holds open files; snapshot economies that record in memory')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def results(self):
+        # flush and map everything written so far
+        self.flush()
+        return load(self.path)
+
+
+def load(path, series=None):
+    # memory-map the recorded columns of a run written by ChunkWriter
+    with open(os.path.join(path, META)) as f:
+        meta = json.load(f)
+    length, width = meta['length'], meta['width']
+    shape = (length,) if width is None else (length, width)
+    columns = {}
+    for name, dtype in meta['series'].items():
+        if series is not None and name not in series:
+            continue
+        if length == 0:
+            columns[name] = np.empty(shape, dtype=dtype)
+        else:
+            columns[name] = np.memmap(column_path(path, name), dtype=dtype, mode='r', shape=shape)
+    return columns
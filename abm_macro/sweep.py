@@ -0,0 +1,132 @@
+"""
+Parameter sweeps
+A sweep runs every (parameter set, seed) cell of a grid on a process pool. Each cell
+is stored under the hash of its model, model version, full parameters, seed, horizon
+and series, so a repeated or interrupted sweep only runs the cells it is missing.
+
+    cells = sweep('simple_macro3', grid({'firm.inertia': [0.5, 0.9], 'policy.switch': [2000, 5000]}),
+                  seeds=range(8), T=10000, cache='sweeps/inertia')
+    results = ResultCache('sweeps/inertia').load(cells[0]['key'])
+
+With convergence={} (or a dict of Convergence arguments) every run ends once it has
+converged; the periods its regimes and run ended at are kept in the cell's meta.
+"""
+import hashlib
+import importlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .convergence import Convergence
+from .params import merge
+
+
+MODELS = ('simple_macro', 'simple_macro3')
+
+
+def model_module(model):
+    if model not in MODELS:
+        raise ValueError('unknown model {!r}, expected one of {}'.format(model, MODELS))
+    return importlib.import_module('.' + model, __package__)
+
+
+def grid(axes):
+    # every combination of the values in axes, e.g. {'firm.inertia': [0.5, 0.9]}
+    names = sorted(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError('{!r} cannot be hashed into a cache key'.format(value))
+
+
+def cell_key(model, params, seed, T, series=None, summary=False, convergence=None):
+    # content address of one cell; params are merged over the defaults first, so
+    # equivalent overrides share a key
+    module = model_module(model)
+    content = {'model': model, 'version': module.VERSION, 'params': merge(module.DEFAULT_PARAMS, params),
+               'seed': seed, 'T': T, 'series': list(series or module.SERIES)}
+    if summary:
+        content['summary'] = True
+    if convergence is not None:
+        content['convergence'] = convergence
+    text = json.dumps(content, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    # one .npz file per cell, written atomically so a killed worker never leaves a
+    # half-written result behind
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.npz')
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def save(self, key, results, meta):
+        path = self.path(key)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp, 'wb') as f:
+            np.savez(f, _meta=np.array(json.dumps(meta, default=_jsonable)), **results)
+        os.replace(tmp, path)
+
+    def load(self, key):
+        with np.load(self.path(key)) as data:
+            return dict((name, data[name]) for name in data.files if name != '_meta')
+
+    def meta(self, key):
+        with np.load(self.path(key)) as data:
+            return json.loads(str(data['_meta']))
+
+
+def run_cell(model, params, seed, T, series, directory, key, summary=False, convergence=None):
+    # worker entry point: simulate one cell and store it, with the periods at which
+    # its regimes and run ended when it stops on convergence
+    module = model_module(model)
+    stop = None if convergence is None else Convergence(**convergence)
+    results = module.run(T, params, seed, series or module.SERIES, stop=stop, summary=summary)
+    meta = {'model': model, 'params': params, 'seed': seed, 'T': T}
+    if stop is not None:
+        meta['events'] = stop.events
+    ResultCache(directory).save(key, results, meta)
+    return key
+
+
+def sweep(model, cells, seeds, T, cache, series=None, workers=None, progress=None, summary=False,
+          convergence=None):
+    # run every cell x seed that is not cached yet on `workers` processes (all cores
+    # by default) and return one record per cell x seed with its cache key;
+    # progress, if given, is called with each key as it completes; with summary=True
+    # only the streaming statistics of each cell are computed and cached; with
+    # convergence, a dict of Convergence arguments ({} for the defaults), every run
+    # stops once it converged, T periods at most
+    store = ResultCache(cache)
+    records, pending, queued = [], [], set()
+    for params in cells:
+        for seed in seeds:
+            key = cell_key(model, params, seed, T, series, summary, convergence)
+            records.append({'params': params, 'seed': seed, 'key': key})
+            if key not in store and key not in queued:
+                queued.add(key)
+                pending.append((model, params, seed, T, series, cache, key, summary, convergence))
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(run_cell, *job) for job in pending]
+            for future in as_completed(futures):
+                key = future.result()
+                if progress is not None:
+                    progress(key)
+    return records
@@ -0,0 +1,250 @@
+"""
+Decision traces
+record() makes a scalar economy append one binary record per period to a trace file:
+every uniform each agent drew, the branch its action decision took (as counted by
+instrument.Probe) and the actions it chose. The file starts with a snapshot of the
+economy when recording began, so replay() can re-drive the model from the trace alone,
+feeding each agent its recorded draws instead of a random stream and checking every
+action against the trace. diff() finds the first period where two traces part.
+
+Actions are recorded as chosen: for SimpleMacro3 the Bank's rate (after any policy
+path), the Firm's price and the Household's consumption share at their current
+interest rate node, before the price floor of 0.01 and the Firm's capacity act on
+them. The simple_macro Household caps its consumption by its asset within its own
+decision, so its consumption is recorded after that cap.
+
+    tracer = record(economy, 'run.trace')
+    economy.run(10000)
+    tracer.close()
+    economy = replay('run.trace', until=7311)     # the state just before period 7311
+    diff('before.trace', 'after.trace')           # {'period': 7311, 'agent': 'firm', ...}
+
+Layout: b'ABMTRACE', a uint32 format version, a uint32-prefixed JSON header (model,
+agents, actions, first period) and a uint64-prefixed pickled snapshot, then per
+period a uint32 period, per agent a uint16 draw count and a uint8 branch followed by
+its draws as float64, and the actions as float64. Integers are little-endian.
+"""
+import json
+import struct
+from array import array
+
+from .checkpoint import restore, snapshot
+from .instrument import BRANCHES, branch
+from .rng import RandomSource
+
+
+MAGIC = b'ABMTRACE'
+FORMAT = 1
+
+AGENTS = ('bank', 'firm', 'household')
+
+# (agent, attribute) of the actions recorded each period, per model
+ACTIONS = {
+    'simple_macro': (('bank', 'interest'), ('firm', 'price'), ('household', 'cons')),
+    'simple_macro3': (('bank', 'irate'), ('firm', 'price'), ('household', 'c')),
+}
+
+# branch code of a period without an action decision
+NO_DECISION = 255
+
+PERIOD = struct.Struct('<I')
+AGENT = struct.Struct('<HB')
+
+
+def model_name(economy):
+    return type(economy).__module__.rsplit('.', 1)[-1]
+
+
+def action(economy, agent, name):
+    # an attribute of the agent, or for a node table column its entry at the agent's
+    # current node
+    agent = getattr(economy, agent)
+    value = getattr(agent, name)
+    if isinstance(value, array):
+        value = value[agent.nodes.slot(agent.irate_node(agent.irate))]
+    return value
+
+
+class TracingSource(RandomSource):
+    # hands out the draws of another source and logs them
+
+    def __init__(self, source):
+        self.source, self.log = source, array('d')
+
+    def random(self):
+        u = self.source.random()
+        self.log.append(u)
+        return u
+
+    def uniforms(self, n):
+        drawn = self.source.uniforms(n)
+        self.log.extend(drawn)
+        return drawn
+
+
+class ReplaySource(RandomSource):
+    # hands out the draws recorded for the current period
+
+    def __init__(self, agent):
+        self.agent, self.draws, self.position = agent, (), 0
+
+    def feed(self, draws):
+        self.draws, self.position = draws, 0
+
+    def random(self):
+        if self.position == len(self.draws):
+            raise ValueError('{} drew more than the {} uniforms recorded'.format(self.agent, len(self.draws)))
+        u = self.draws[self.position]
+        self.position += 1
+        return u
+
+    def uniforms(self, n):
+        return [self.random() for k in range(n)]
+
+
+class Tracer:
+    # the Probe of the agents while recording, keeping each agent's last branch
+
+    def __init__(self, economy, path):
+        self.economy, self.model = economy, model_name(economy)
+        self.actions = ACTIONS[self.model]
+        self.branches = dict.fromkeys(AGENTS, NO_DECISION)
+        header = json.dumps({'model': self.model, 'agents': AGENTS, 'actions': self.actions,
+                             'start': economy.t}).encode('utf-8')
+        snap = snapshot(economy)
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC + struct.pack('<II', FORMAT, len(header)) + header)
+        self.file.write(struct.pack('<Q', len(snap)) + snap)
+        self.sources = {}
+        for name in AGENTS:
+            agent = getattr(economy, name)
+            agent.rng = self.sources[name] = TracingSource(agent.rng)
+            agent.probe = self
+        step = economy.step
+
+        def traced_step():
+            step()
+            self.write(economy.t - 1)
+        economy.step = traced_step
+
+    def decision(self, agent, inertia, tremble, satisficing):
+        self.branches[agent] = BRANCHES.index(branch(inertia, tremble, satisficing))
+
+    def write(self, t):
+        chunks = [PERIOD.pack(t)]
+        for name in AGENTS:
+            log = self.sources[name].log
+            chunks.append(AGENT.pack(len(log), self.branches[name]))
+            chunks.append(log.tobytes())
+            del log[:]
+            self.branches[name] = NO_DECISION
+        chunks.append(array('d', [action(self.economy, agent, name) for agent, name in self.actions]).tobytes())
+        self.file.write(b''.join(chunks))
+
+    def close(self):
+        # stop recording and give the agents back their random streams
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        for name in AGENTS:
+            agent = getattr(self.economy, name)
+            agent.rng = self.sources[name].source
+            agent.__dict__.pop('probe', None)
+        self.economy.__dict__.pop('step', None)
+
+
+def record(economy, path):
+    # start tracing every following period of economy into path
+    return Tracer(economy, path)
+
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('not a decision trace')
+    version, size = struct.unpack('<II', f.read(8))
+    if version != FORMAT:
+        raise ValueError('trace format {} is not supported'.format(version))
+    header = json.loads(f.read(size).decode('utf-8'))
+    size, = struct.unpack('<Q', f.read(8))
+    return header, f.read(size)
+
+
+def periods(path):
+    # the records of a trace: (period, {agent: (branch code, draws)}, actions)
+    with open(path, 'rb') as f:
+        header, snap = read_header(f)
+        width = len(header['actions'])
+        while True:
+            # a record cut short by a crash ends the trace
+            head = f.read(PERIOD.size)
+            if len(head) < PERIOD.size:
+                return
+            t, = PERIOD.unpack(head)
+            agents = {}
+            for name in header['agents']:
+                head = f.read(AGENT.size)
+                if len(head) < AGENT.size:
+                    return
+                count, code = AGENT.unpack(head)
+                draws = f.read(8*count)
+                if len(draws) < 8*count:
+                    return
+                agents[name] = (code, array('d', draws))
+            actions = f.read(8*width)
+            if len(actions) < 8*width:
+                return
+            yield t, agents, array('d', actions)
+
+
+def replay(path, until=None):
+    # the economy re-driven by the recorded draws up to period `until` (exclusive;
+    # the end of the trace by default), checking every action on the way
+    with open(path, 'rb') as f:
+        header, snap = read_header(f)
+    economy = restore(snap)
+    sources = dict((name, ReplaySource(name)) for name in header['agents'])
+    for name, source in sources.items():
+        getattr(economy, name).rng = source
+    for t, agents, actions in periods(path):
+        if until is not None and t >= until:
+            break
+        for name, (code, draws) in agents.items():
+            sources[name].feed(draws)
+        economy.step()
+        for name, source in sources.items():
+            if source.position != len(source.draws):
+                raise ValueError('period {}: {} drew {} of {} recorded uniforms'.format(
+                    t, name, source.position, len(source.draws)))
+        replayed = [action(economy, agent, name) for agent, name in header['actions']]
+        if list(actions) != replayed:
+            raise ValueError('period {}: replayed actions {} differ from recorded {}'.format(t, replayed, list(actions)))
+    return economy
+
+
+def diff(path_a, path_b):
+    # the first period where two traces differ, as a dict naming the agent and what
+    # differs ('draws', 'branch', 'actions' or 'length'); None if they agree
+    a, b = periods(path_a), periods(path_b)
+    while True:
+        ra, rb = next(a, None), next(b, None)
+        if ra is None and rb is None:
+            return None
+        if ra is None or rb is None:
+            return {'period': (rb or ra)[0], 'agent': None, 'field': 'length',
+                    'a': ra is not None, 'b': rb is not None}
+        if ra[0] != rb[0]:
+            return {'period': min(ra[0], rb[0]), 'agent': None, 'field': 'period', 'a': ra[0], 'b': rb[0]}
+        for name in ra[1]:
+            (branch_a, draws_a), (branch_b, draws_b) = ra[1][name], rb[1][name]
+            if draws_a != draws_b:
+                return {'period': ra[0], 'agent': name, 'field': 'draws', 'a': list(draws_a), 'b': list(draws_b)}
+            if branch_a != branch_b:
+                return {'period': ra[0], 'agent': name, 'field': 'branch',
+                        'a': branch_name(branch_a), 'b': branch_name(branch_b)}
+        if ra[2] != rb[2]:
+            return {'period': ra[0], 'agent': None, 'field': 'actions', 'a': list(ra[2]), 'b': list(rb[2])}
+
+
+def branch_name(code):
+    return None if code == NO_DECISION else BRANCHES[code]
@@ -0,0 +1,77 @@
+"""
+Multi-resolution views of recorded series
+A Pyramid aggregates one series into blocks of 2**k periods, keeping per block the
+mean, min and max, so a plot at any resolution needs only as many points as it has
+pixels while still showing every spike in the min/max envelope. Levels are computed
+with vectorized reductions on first use, from the finest level already computed, and
+cached. A View holds the pyramids of a whole results dict, e.g. one read back from
+storage, whose series may be memory-mapped.
+
+    view = View(results)
+    periods, mean, low, high = view.level('price', width=800)
+    plotting.plot_simple_macro3(view, 'run.png')     # reuses the levels of view
+"""
+import numpy as np
+
+
+class Pyramid:
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        self.n = len(values)
+        # level k: (mean, min, max, finite periods) of the blocks of 2**k periods;
+        # the last block holds the remainder
+        self.levels = {0: (values, values, values, None)}
+
+    def depth(self, width):
+        # the finest level with at most `width` blocks
+        k = 0
+        while -(-self.n//2**k) > max(width, 1):
+            k += 1
+        return k
+
+    def aggregate(self, k):
+        if k in self.levels:
+            return self.levels[k]
+        j = max(level for level in self.levels if level < k)
+        mean, low, high, counts = self.levels[j]
+        factor = 2**(k - j)
+        starts = np.arange(0, len(mean), factor)
+        # counts are the finite periods of each block, so missing values (such as the
+        # first inflation of SimpleMacro) are skipped and an all-missing block is NaN
+        if counts is None:
+            counts = np.isfinite(mean).astype(float)
+        totals = np.where(counts > 0, mean*counts, 0)
+        weights = np.add.reduceat(counts, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.add.reduceat(totals, starts, dtype=float)/weights
+        self.levels[k] = (mean, np.fmin.reduceat(low, starts), np.fmax.reduceat(high, starts), weights)
+        return self.levels[k]
+
+    def level(self, width):
+        # (block midpoints in periods, mean, min, max) at the resolution fitting width
+        k = self.depth(width)
+        mean, low, high, counts = self.aggregate(k)
+        size = 2**k
+        periods = np.arange(len(mean))*size + (np.minimum(size, self.n - np.arange(len(mean))*size) - 1)/2.0
+        return periods, mean, low, high
+
+
+class View:
+
+    def __init__(self, results):
+        self.results, self.pyramids = results, {}
+
+    def __getitem__(self, name):
+        if name not in self.pyramids:
+            self.pyramids[name] = Pyramid(self.results[name])
+        return self.pyramids[name]
+
+    def level(self, name, width):
+        return self[name].level(width)
+
+
+def pixel_width(ax):
+    # width of the axes in pixels of the saved figure
+    fig = ax.get_figure()
+    return int(fig.get_figwidth()*fig.dpi*ax.get_position().width)
@@ -0,0 +1,14 @@
+import numpy as np
+
+
+def same(a, b):
+    # the same series with the same values, missing ones included
+    return set(a) == set(b) and all(np.array_equal(a[name], b[name], equal_nan=True) for name in a)
+
+
+def agree(a, b, z=4):
+    # whether the mean moments of two sets of runs, one row per run, agree within z
+    # standard errors of their difference
+    a, b = np.asarray(a), np.asarray(b)
+    error = np.sqrt(a.var(axis=0, ddof=1)/len(a) + b.var(axis=0, ddof=1)/len(b))
+    return (np.abs(a.mean(axis=0) - b.mean(axis=0)) < z*error).all()
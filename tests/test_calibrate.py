@@ -0,0 +1,26 @@
+import gc
+import os
+import tempfile
+
+from abm_macro.calibrate import Calibration
+from abm_macro.sensitivity import morris
+
+
+def test_calibration_removes_its_scratch_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    calibration = Calibration({'price.mean': 0.95}, bounds={'firm.inertia': (0.5, 0.9)},
+                              T=50, replications=1, workers=1, resolution=4)
+    (distance, moments), = calibration.evaluate([(2,)])
+    assert distance >= 0 and set(moments) == {'price.mean'}
+    assert os.listdir(str(tmp_path))
+    del calibration
+    gc.collect()
+    assert not os.listdir(str(tmp_path))
+
+
+def test_morris_leaves_no_scratch_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    analysis = morris(factors={'firm.inertia': (0.5, 0.9), 'firm.delta': (0.01, 0.1)}, trajectories=2,
+                      T=50, replications=1, workers=1, draws=10)
+    assert set(analysis['indices']['price.var']) == {'firm.inertia', 'firm.delta'}
+    assert not os.listdir(str(tmp_path))
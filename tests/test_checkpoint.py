@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from abm_macro import simple_macro, simple_macro3
+from abm_macro.checkpoint import branch, fork, restore, snapshot
+from abm_macro.policies import StepPolicy
+from helpers import same
+
+
+@pytest.mark.parametrize('model', [simple_macro, simple_macro3])
+def test_restored_economy_continues_exactly(model):
+    whole = model.Economy(seed=1).run(600)
+    economy = model.Economy(seed=1)
+    economy.run(200)
+    assert same(whole, restore(snapshot(economy)).run(400))
+
+
+def test_forked_branches_share_the_burn_in():
+    economy = simple_macro3.Economy({'policy': None}, seed=2)
+    economy.run(300)
+    snap = snapshot(economy)
+    policies = [StepPolicy(300, 0.05, 0.05), StepPolicy(300, 0.05, 0.08)]
+    direct = simple_macro3.Economy({'policy': None}, seed=2)
+    direct.run(300)
+    direct.policy = policies[0]
+    whole = direct.run(300)
+    first, second = [b.run(300) for b in fork(snap, policies)]
+    assert same(whole, first)
+    assert np.array_equal(first['price'][:300], second['price'][:300])
+    assert not np.array_equal(first['interest'][300:], second['interest'][300:])
+
+
+def test_snapshot_keeps_only_recorded_periods():
+    economy, short = simple_macro3.Economy(seed=3, horizon=100000), simple_macro3.Economy(seed=3, horizon=100)
+    economy.run(100)
+    short.run(100)
+    assert len(snapshot(economy)) == len(snapshot(short))
+    restored = restore(snapshot(economy))
+    restored.run(2000)
+    assert len(restored.results()['price']) == 2100
+
+
+def test_simple_macro_branches_take_no_policy():
+    economy = simple_macro.Economy(seed=1)
+    economy.run(10)
+    with pytest.raises(ValueError):
+        branch(snapshot(economy), StepPolicy(20, 0.05, 0.07))
+    assert branch(snapshot(economy), None, seed=4).run(10)['price'].shape == (20,)
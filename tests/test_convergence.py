@@ -0,0 +1,24 @@
+import numpy as np
+
+from abm_macro import simple_macro3
+from abm_macro.convergence import Convergence
+
+
+def test_run_stops_after_bringing_the_switch_forward():
+    stop = Convergence()
+    results = simple_macro3.run(20000, seed=1, stop=stop)
+    (regime, switch), (end, period) = stop.events
+    assert (regime, end) == ('regime', 'stop')
+    assert switch < simple_macro3.DEFAULT_PARAMS['policy']['switch']
+    assert period == stop.period == len(results['price'])
+    # the rate jumps to the policy's `after` rate at the new switch
+    assert np.allclose(results['interest'][switch - 1], 5) and np.allclose(results['interest'][switch:], 8)
+
+
+def test_summary_splits_at_the_moved_switch():
+    full = simple_macro3.run(20000, seed=1, stop=Convergence())
+    stop = Convergence()
+    summary = simple_macro3.run(20000, seed=1, stop=stop, summary=True)
+    switch = stop.events[0][1]
+    assert np.isclose(summary['price.before'], full['price'][:switch].mean())
+    assert np.isclose(summary['price.after'], full['price'][switch:].mean())
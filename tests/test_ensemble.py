@@ -0,0 +1,33 @@
+import numpy as np
+
+from abm_macro import kernel, simple_macro3
+from abm_macro.ensemble import run_ensemble
+from helpers import agree
+
+
+MOMENTS = ('consumption', 'price', 'capital', 'asset', 'profit')
+
+
+def test_ensemble_matches_simple_macro3():
+    # per-economy moments after a burn-in agree with those of scalar economies within
+    # sampling error
+    n = 40
+    results = run_ensemble(1000, n, seed=1)
+    ensemble = np.array([results[name][300:].mean(axis=0) for name in MOMENTS]).T
+    scalar = []
+    for seed in range(n):
+        q = simple_macro3.run(1000, seed=(seed, 2))
+        scalar.append([q[name][300:].mean() for name in MOMENTS])
+    assert agree(ensemble, scalar)
+
+
+
+def test_array_steps_match_scalar_steps():
+    # every agent's step rule moves arrays of actions as it moves one action each way
+    x, u = np.array([0.02, 0.5, 0.98, 0.5]), np.array([0.1, 0.9, 0.99, 0.5])
+    for agent in (simple_macro3.Bank, simple_macro3.Household, simple_macro3.Firm):
+        rule = agent.step_rule()
+        for way, up, down in ((kernel.BOTH, False, False), (kernel.UP, True, False), (kernel.DOWN, False, True)):
+            steps = rule.steps(x, np.array([True, True, True, False]), np.full(4, up), np.full(4, down), u)
+            scalar = [rule(x[k], way, u[k]) for k in range(3)] + [x[3]]
+            assert np.array_equal(steps, scalar)
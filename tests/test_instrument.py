@@ -0,0 +1,48 @@
+import time
+
+from abm_macro import simple_macro3
+from abm_macro.ensemble import Ensemble
+from abm_macro.instrument import BRANCHES, attach, detach
+from abm_macro.population import Population
+
+
+def decisions(probe, agent):
+    return sum(probe.branches[agent, branch] for branch in BRANCHES)
+
+
+def test_phase_times_add_up_to_the_time_stepped():
+    # the Bank's evaluate runs inside its transfer_evaluate and is counted once
+    T = 2000
+    economy = simple_macro3.Economy(seed=1)
+    probe = attach(economy)
+    start = time.perf_counter()
+    economy.run(T)
+    elapsed = time.perf_counter() - start
+    assert probe.calls['bank.evaluate'] == probe.calls['bank.transfer_evaluate'] == probe.calls['step'] == T
+    assert min(probe.seconds.values()) >= 0
+    assert sum(probe.seconds.values()) <= elapsed
+    assert decisions(probe, 'bank') == decisions(probe, 'firm') == T
+
+
+def test_ensembles_count_every_economy_s_decisions():
+    T, n = 50, 30
+    economy = Ensemble(n, seed=1)
+    probe = attach(economy)
+    economy.run(T, series=())
+    for agent in ('bank', 'firm', 'household'):
+        assert decisions(probe, agent) == T*n
+    assert probe.calls['step'] == probe.calls['household.consume'] == T
+    detach(economy)
+    economy.run(10, series=())
+    assert probe.calls['step'] == T and decisions(probe, 'bank') == T*n
+
+
+def test_populations_count_every_agent_s_decisions():
+    T, households, firms = 50, 300, 20
+    economy = Population(households, firms, seed=1)
+    probe = attach(economy)
+    economy.run(T)
+    assert decisions(probe, 'bank') == T
+    assert decisions(probe, 'firm') == T*firms
+    assert decisions(probe, 'household') == T*households
+    assert probe.calls['firm.set_price'] == probe.calls['household.consume'] == T
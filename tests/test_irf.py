@@ -0,0 +1,21 @@
+import numpy as np
+
+from abm_macro.irf import Shock, impulse_response
+
+
+def test_a_zero_shock_has_no_response():
+    # the twins meet the same draws, so without a shock they never part
+    irf = impulse_response(Shock(size=0.0, duration=10), horizon=60, n=20, burn_in=200, seed=1)
+    for name, response in irf.items():
+        assert np.array_equal(response['mean'], np.zeros(60)), name
+        assert np.array_equal(response['se'], np.zeros(60)), name
+
+
+def test_the_rate_responds_by_the_shock_path():
+    # the imposed rate, in percent, holds the shock for its duration and then decays
+    shock = Shock(size=0.01, start=3, duration=5, persistence=0.5)
+    irf = impulse_response(shock, horizon=20, n=20, burn_in=200, seed=1)
+    expected = 100*np.array([0]*3 + [0.01]*5 + [0.01*0.5**k for k in range(1, 13)])
+    assert np.allclose(shock.path(20)*100, expected)
+    assert np.allclose(irf['interest']['mean'], expected, rtol=0, atol=1e-12)
+    assert np.allclose(irf['interest']['se'], 0, atol=1e-12)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from abm_macro import simple_macro, simple_macro3
+from abm_macro.ensemble import Ensemble
+from abm_macro.monitor import Monitor, Trail
+
+
+@pytest.mark.parametrize('model', [simple_macro, simple_macro3])
+def test_monitor_draws_the_recorded_series(model, tmp_path):
+    path = str(tmp_path / 'live.png')
+    monitor = Monitor(path=path, fps=100)
+    economy = model.Economy(seed=1)
+    tap = monitor.attach(economy, batch=50)
+    results = economy.run(500)
+    monitor.close()
+    assert monitor.series == tuple(model.SERIES)
+    assert monitor.process.exitcode == 0
+    assert (tmp_path / 'live.png').exists()
+    assert len(results['price']) == 500 and tap.dropped <= 500
+
+
+def test_unrecorded_panels_are_rejected():
+    with pytest.raises(ValueError):
+        Monitor(series=('irate',)).attach(simple_macro.Economy(seed=1))
+    with pytest.raises(ValueError):
+        Monitor().attach(Ensemble(3, seed=1))
+
+
+def test_trail_history_averages_the_whole_run():
+    trail = Trail(window=10, capacity=8)
+    values = np.arange(100.0)
+    for block in np.split(values, 10):
+        trail.extend(block)
+    periods, latest = trail.latest()
+    assert np.array_equal(latest, values[-10:])
+    assert np.isclose(trail.buckets[:trail.used].mean(), values[:trail.used*trail.size].mean())
@@ -0,0 +1,30 @@
+import numpy as np
+
+from abm_macro import network, simple_macro3
+from abm_macro.rng import run_seed, seed_sequence
+from helpers import same
+
+
+def test_unlinked_regions_are_simple_macro3_economies():
+    results = network.run_network(200, 3, links=np.zeros((3, 3)), seed=3, workers=1)
+    for r in range(3):
+        alone = simple_macro3.Economy(None, run_seed(seed_sequence(3), r), 200).run(200)
+        assert same(alone, dict((name, results[name][:, r]) for name in alone))
+
+
+def test_linked_regions_trade():
+    results = network.run_network(200, 6, seed=5, workers=1)
+    assert (results['exported'] > 0).mean() > 0.5
+    assert np.isclose(results['exported'].sum(axis=1), results['imported'].sum(axis=1)).all()
+
+
+def test_results_do_not_depend_on_workers():
+    serial = network.run_network(100, 7, seed=5, workers=1)
+    assert same(serial, network.run_network(100, 7, seed=5, workers=3))
+
+
+def test_consecutive_runs_continue():
+    whole = network.run_network(100, 5, seed=2, workers=2)
+    with network.Network(5, seed=2, workers=2) as linked:
+        first, second = linked.run(40), linked.run(60)
+    assert same(whole, dict((name, np.vstack([first[name], second[name]])) for name in whole))
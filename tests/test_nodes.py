@@ -0,0 +1,53 @@
+import numpy as np
+
+from abm_macro.nodes import NodeArrays, NodeTable
+
+
+def by_node(nodes, width):
+    # initial rows that depend on the node only, whatever the order of visits
+    return np.asarray(nodes)[:, None]*10.0 + np.arange(width)
+
+
+def test_node_table_columns_are_separate_and_keep_their_identity():
+    table = NodeTable({'price': 1.0, 'Val': 0})
+    price = table['price']
+    for node in (7, 3, 9):
+        table.columns['price'][table.slot(node)] = node
+    assert table['price'] is price
+    assert list(table['Val']) == [0, 0, 0]
+    assert table.value('price', 3) == 3 and len(table) == 3
+
+
+def test_node_tables_do_not_depend_on_the_order_of_visits():
+    tables = []
+    for order in ((1, 4, 2, 4), (2, 2, 4, 1)):
+        table = NodeTable({'c': 0.3, 'Val': 0})
+        for node in order:
+            slot = table.slot(node)
+            table['Val'][slot] = 2.0*node
+        tables.append(table)
+    for name in ('c', 'Val'):
+        assert np.array_equal(tables[0].dense(name, 6), tables[1].dense(name, 6), equal_nan=True)
+    assert np.isnan(tables[0].dense('c', 6)[[0, 3, 5]]).all()
+
+
+def test_node_arrays_do_not_depend_on_the_order_of_visits():
+    # each economy looks up its own node; rows grow past the initial capacity
+    width, dense = 3, []
+    visits = [np.array([5, 1, 5]), 2, np.array([0, 0, 7])]
+    for order in (visits, visits[::-1]):
+        nodes = NodeArrays(8, width, {'price': by_node, 'SatLv': 0}, capacity=2)
+        for visit in order:
+            if np.ndim(visit) == 0:
+                row = nodes.row(visit)
+                nodes['SatLv'][row] += visit
+            else:
+                index = nodes.index(visit)
+                assert np.array_equal(nodes['price'].take(index), visit*10.0 + np.arange(width))
+                nodes['SatLv'].put(index, nodes['SatLv'].take(index) + visit)
+        assert not np.shares_memory(nodes['price'], nodes['SatLv'])
+        dense.append([nodes.dense(name) for name in ('price', 'SatLv')])
+    visited = [0, 1, 2, 5, 7]
+    for first, second in zip(*dense):
+        assert np.array_equal(first[visited], second[visited])
+    assert np.isnan(dense[0][0][[3, 4, 6]]).all()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from abm_macro.policy_search import PolicySearch, TaylorRule, dominated, fronts
+
+
+def test_dominated_rows():
+    scores = np.array([[1.0, 1.0], [2.0, 0.0], [0.0, 2.0], [0.5, 0.5], [1.0, 1.0], [2.0, -1.0]])
+    # ties do not dominate each other; a row beaten on one objective and tied on
+    # the other is dominated
+    assert dominated(scores).tolist() == [False, False, False, True, False, True]
+    assert fronts(scores).tolist() == [0, 0, 0, 1, 0, 1]
+
+
+def test_taylor_rule_within_bounds():
+    class Bank:
+        output, inflation = np.array([1.0, 10.0]), np.array([0.0, 0.0])
+    rule = TaylorRule(np.array([0.01, 0.05]), 0.0, floor=0.001, cap=0.1, initial=0.05)
+    assert rule(0, Bank) == 0.05
+    assert np.allclose(rule(1, Bank), [0.01, 0.1])
+
+
+def test_search_returns_a_frontier_of_candidates():
+    search = PolicySearch(points=3, T=60, replications=2, rungs=2, burn=0.5)
+    fit = search.run()
+    assert fit['frontier']
+    assert not dominated(fit['scores'][fronts(fit['scores']) == 0]).any()
+    assert len(fit['candidates']) <= 9
@@ -0,0 +1,36 @@
+import numpy as np
+
+from abm_macro import simple_macro3
+from abm_macro.population import Population, run_population
+from helpers import agree
+
+
+MOMENTS = ('consumption', 'price', 'capital', 'asset')
+
+
+def test_large_population_stays_bounded():
+    # a hundred households per firm, as in the defaults
+    economy = Population(10000, 100, params={'policy': None}, seed=1)
+    results = economy.run(2000)
+    per_household = results['asset']/10000
+    assert np.isfinite(per_household).all()
+    assert per_household.max() < 20
+    assert (economy.households.asset > 0).all()
+    assert (results['consumption'] > 0).all()
+    assert (economy.firms.capital > 0).mean() > 0.9
+
+
+def test_every_firm_has_customers():
+    economy = Population(10, 4, seed=1)
+    assert (economy.households.customers > 0).all()
+
+
+def test_one_household_one_firm_matches_simple_macro3():
+    # moments after a burn-in, across seeds, agree within sampling error
+    population, scalar = [], []
+    for seed in range(20):
+        p = run_population(1000, 1, 1, seed=seed)
+        q = simple_macro3.run(1000, seed=(seed, 1))
+        population.append([p[name][300:].mean() for name in MOMENTS])
+        scalar.append([q[name][300:].mean() for name in MOMENTS])
+    assert agree(population, scalar)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from abm_macro import simple_macro, simple_macro3
+from abm_macro.instrument import attach
+from abm_macro.rng import RandomSource
+
+
+def within(observed, expected, n, z=4):
+    return abs(observed - expected) < z*np.sqrt(expected*(1 - expected)/n)
+
+
+def test_run_lengths_are_geometric():
+    source, p, n = RandomSource(1), 0.9, 50000
+    lengths = np.array([source.run_length(p) for k in range(n)])
+    for k in range(5):
+        assert within((lengths == k).mean(), p**k*(1 - p), n)
+    assert within((lengths >= 20).mean(), p**20, n)
+    assert source.run_length(0) == 0
+
+
+@pytest.mark.parametrize('model, tremble', [(simple_macro, 'TrblProbAction'), (simple_macro3, 'TrblActn')])
+def test_event_schedule_keeps_the_branch_frequencies(model, tremble):
+    # geometric waits between decisions make every period inertial with probability
+    # inertia, independently, as the period schedule draws it
+    T = 20000
+    economy = model.Economy({'schedule': 'event'}, seed=1)
+    probe = attach(economy)
+    economy.run(T)
+    for agent in ('bank', 'firm'):
+        params = model.DEFAULT_PARAMS[agent]
+        inertial = probe.branches[agent, 'inertia']
+        assert within(inertial/T, params['inertia'], T)
+        decisions = T - inertial
+        assert within(probe.branches[agent, 'tremble']/decisions, params[tremble], decisions)
+
+
+def test_unknown_schedules_are_rejected():
+    with pytest.raises(ValueError):
+        simple_macro.Economy({'schedule': 'daily'})
@@ -0,0 +1,42 @@
+import numpy as np
+
+from abm_macro import simple_macro, simple_macro3
+from abm_macro.stats import RunningMoments
+
+
+def acf(x, k):
+    return np.corrcoef(x[:-k], x[k:])[0, 1]
+
+
+def test_summary_matches_statistics_of_the_full_series():
+    full = simple_macro3.run(8000, seed=4)
+    summary = simple_macro3.run(8000, seed=4, summary=True, lags=(1, 5))
+    switch = simple_macro3.DEFAULT_PARAMS['policy']['switch']
+    for name, x in full.items():
+        finite = x[np.isfinite(x)]
+        assert summary[name + '.count'] == len(finite)
+        assert np.isclose(summary[name + '.mean'], finite.mean())
+        assert np.isclose(summary[name + '.var'], finite.var(ddof=1))
+        for k in (1, 5):
+            if finite.std() > 0:
+                assert np.isclose(summary['{}.acf{}'.format(name, k)], acf(finite, k))
+    price = full['price']
+    assert np.isclose(summary['price.before'], price[:switch].mean())
+    assert np.isclose(summary['price.after'], price[switch:].mean())
+
+
+def test_summary_skips_the_missing_first_inflation():
+    full = simple_macro.run(500, seed=1)
+    summary = simple_macro.run(500, seed=1, summary=True)
+    inflation = full['inflation'][np.isfinite(full['inflation'])]
+    assert summary['inflation.count'] == len(inflation)
+    assert np.isclose(summary['inflation.mean'], inflation.mean())
+
+
+def test_running_moments_of_arrays():
+    x = np.random.default_rng(0).normal(size=(200, 3))
+    moments = RunningMoments(3)
+    for row in x:
+        moments.update(row)
+    assert np.allclose(moments.mean, x.mean(axis=0))
+    assert np.allclose(moments.var, x.var(axis=0, ddof=1))
@@ -0,0 +1,41 @@
+import os
+
+from abm_macro import simple_macro3
+from abm_macro.sweep import ResultCache, cell_key, grid, sweep
+from helpers import same
+
+
+def test_cached_cells_are_skipped_and_missing_ones_resumed(tmp_path):
+    cells, cache = grid({'firm.inertia': [0.5, 0.9]}), str(tmp_path)
+    done = []
+    records = sweep('simple_macro3', cells, seeds=[1, 2], T=200, cache=cache, workers=1, progress=done.append)
+    assert sorted(done) == sorted(record['key'] for record in records)
+    done[:] = []
+    sweep('simple_macro3', cells, seeds=[1, 2], T=200, cache=cache, workers=1, progress=done.append)
+    assert done == []
+    # a sweep interrupted before its last cell reruns only that cell
+    store = ResultCache(cache)
+    os.remove(store.path(records[-1]['key']))
+    sweep('simple_macro3', cells, seeds=[1, 2], T=200, cache=cache, workers=1, progress=done.append)
+    assert done == [records[-1]['key']]
+    direct = simple_macro3.run(200, cells[-1], 2)
+    cached = store.load(records[-1]['key'])
+    assert same(direct, cached)
+
+
+def test_equivalent_overrides_share_a_key():
+    default = simple_macro3.DEFAULT_PARAMS['firm']['inertia']
+    assert cell_key('simple_macro3', {}, 1, 100) == cell_key('simple_macro3', {'firm.inertia': default}, 1, 100)
+    assert cell_key('simple_macro3', {}, 1, 100) != cell_key('simple_macro3', {}, 2, 100)
+
+
+def test_sweeps_stop_converged_runs(tmp_path):
+    cache = str(tmp_path)
+    records = sweep('simple_macro3', [{}], seeds=[1], T=20000, cache=cache, workers=1, summary=True,
+                    convergence={})
+    key = records[0]['key']
+    assert key != cell_key('simple_macro3', {}, 1, 20000, summary=True)
+    store = ResultCache(cache)
+    stopped = dict(store.meta(key)['events'])['stop']
+    assert stopped < 20000
+    assert store.load(key)['price.count'] == stopped
@@ -0,0 +1,44 @@
+import pytest
+
+from abm_macro import simple_macro, simple_macro3
+from abm_macro.trace import diff, periods, record, replay
+from helpers import same
+
+
+def traced(model, path, T, seed=1, params=None):
+    economy = model.Economy(params, seed=seed)
+    economy.run(50)
+    tracer = record(economy, str(path))
+    economy.run(T)
+    tracer.close()
+    return economy
+
+
+@pytest.mark.parametrize('model', [simple_macro, simple_macro3])
+def test_replay_reproduces_the_recorded_run(model, tmp_path):
+    path = tmp_path / 'run.trace'
+    economy = traced(model, path, 300)
+    replayed = replay(str(path))
+    assert replayed.t == economy.t
+    whole, again = economy.results(), replayed.results()
+    assert same(whole, again)
+    halfway = replay(str(path), until=200)
+    assert halfway.t == 200
+
+
+def test_recorded_actions_are_the_choices(tmp_path):
+    path = tmp_path / 'run.trace'
+    economy = traced(simple_macro3, path, 100)
+    t, agents, actions = list(periods(str(path)))[-1]
+    f, h = economy.firm, economy.household
+    assert list(actions) == [economy.bank.irate, f.price[f.nodes.slot(f.irate_node(f.irate))],
+                             h.c[h.nodes.slot(h.irate_node(h.irate))]]
+
+
+def test_diff_finds_the_first_difference(tmp_path):
+    a, b = tmp_path / 'a.trace', tmp_path / 'b.trace'
+    traced(simple_macro3, a, 100)
+    traced(simple_macro3, b, 100)
+    assert diff(str(a), str(b)) is None
+    traced(simple_macro3, b, 100, params={'firm.inertia': 0.5})
+    assert diff(str(a), str(b))['period'] >= 50
@@ -0,0 +1,38 @@
+import numpy as np
+
+from abm_macro import simple_macro
+from abm_macro.plotting import plot_simple_macro
+from abm_macro.views import Pyramid, View
+
+
+def test_levels_match_block_statistics():
+    values = np.random.default_rng(0).normal(size=1000)
+    pyramid = Pyramid(values)
+    periods, mean, low, high = pyramid.level(100)
+    size = 1000//len(mean) + (1000 % len(mean) > 0)
+    blocks = [values[k:k + size] for k in range(0, 1000, size)]
+    assert np.allclose(mean, [block.mean() for block in blocks])
+    assert np.array_equal(low, [block.min() for block in blocks])
+    assert np.array_equal(high, [block.max() for block in blocks])
+
+
+def test_missing_values_are_skipped():
+    values = np.arange(64.0)
+    values[[0, 2, 5]] = np.nan
+    for width in (32, 8, 1):
+        periods, mean, low, high = Pyramid(values).level(width)
+        blocks = values.reshape(len(mean), -1)
+        assert np.allclose(mean, np.nanmean(blocks, axis=1))
+        assert np.array_equal(low, np.nanmin(blocks, axis=1))
+        assert np.array_equal(high, np.nanmax(blocks, axis=1))
+    periods, mean, low, high = Pyramid(np.full(8, np.nan)).level(2)
+    assert np.isnan(mean).all()
+
+
+def test_plots_reuse_a_view(tmp_path):
+    view = View(simple_macro.run(5000, seed=1))
+    plot_simple_macro(view, str(tmp_path / 'a.png'))
+    pyramids = dict(view.pyramids)
+    assert np.isfinite(view.level('inflation', 10)[1]).all()
+    plot_simple_macro(view, str(tmp_path / 'b.png'))
+    assert all(view.pyramids[name] is pyramid for name, pyramid in pyramids.items())